@@ -0,0 +1,578 @@
+# backend/app/catalog.py
+# In-memory catalog - flows and steps are read from YAML once, not per request
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Any, Optional, List, Dict, Tuple
+
+import yaml
+from starlette.concurrency import run_in_threadpool
+
+from app.eligibility import EligibilityIndex
+from app.facets import FacetIndex
+from app.incremental import IncrementalScorer
+from app.intake import IntakeModel
+from app.metrics import metrics
+from app.models import CatalogValidationError, Flow, Step
+from app.projections import (
+    FLOW_PRESETS, FLOWS_PRESETS, MAX_CUSTOM_PROJECTIONS, project_flow, project_flows,
+)
+from app.schedule import schedule_flow
+from app.scoring import IntakeWeights, recommendation_table
+from app.search import SearchIndex
+from app.states import (
+    FlowDependencies, StateRegistry, bit_positions, merge_flows,
+)
+from app.responses import Payload, dump_json
+from app.versioning import build_patch, body_hash, catalog_hash, entity_hash, load_history, resolve_version
+
+# Paths
+BASE_DIR = Path(__file__).parent.parent.parent  # backend/app -> backend -> project root
+FLOWS_DIR = BASE_DIR / "data" / "flows"
+STEPS_DIR = BASE_DIR / "data" / "steps"
+HISTORY_PATH = BASE_DIR / "data" / "catalog_history.json"
+DOCUMENTS_PATH = BASE_DIR / "data" / "reference" / "documents.yaml"
+
+# Merged multi-flow plans are memoized per flow set, up to this many
+MAX_MERGED_PLANS = 256
+# Flow schedules are memoized per (flow, anchor date), least recently used evicted past this many
+MAX_SCHEDULES = 1024
+
+
+def load_all_flows(flows_dir: Path = FLOWS_DIR) -> List[dict]:
+    flows = []
+    if not flows_dir.exists():
+        return flows
+
+    for yaml_file in sorted(flows_dir.glob("*.yaml")):
+        try:
+            with open(yaml_file, 'r', encoding='utf-8') as f:
+                flow = yaml.safe_load(f)
+                if flow:
+                    flows.append(flow)
+        except Exception as e:
+            print(f"Error loading {yaml_file}: {e}")
+
+    return flows
+
+
+def load_all_steps(steps_dir: Path = STEPS_DIR) -> Dict[str, dict]:
+    """Load every step file, keyed by file name (the step_id flows refer to)"""
+    steps = {}
+    if not steps_dir.exists():
+        return steps
+
+    for yaml_file in sorted(steps_dir.glob("*.yaml")):
+        try:
+            with open(yaml_file, 'r', encoding='utf-8') as f:
+                step = yaml.safe_load(f)
+                if step:
+                    steps[yaml_file.stem] = step
+        except Exception as e:
+            print(f"Error loading step {yaml_file.stem}: {e}")
+
+    return steps
+
+
+def load_documents(path: Path = DOCUMENTS_PATH) -> Dict[str, dict]:
+    """Canonical document types (data/reference/documents.yaml), keyed by id"""
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return (yaml.safe_load(f) or {}).get('documents') or {}
+    except Exception as e:
+        print(f"Error loading documents {path}: {e}")
+        return {}
+
+
+def summarize_flow(flow: dict) -> dict:
+    """Flow metadata as listed by GET /flows"""
+    display_info = flow.get('display_info', {})
+    return {
+        "flow_id": flow.get('flow_id'),
+        "title": display_info.get('title', flow.get('flow_id')),
+        "category": display_info.get('category', 'General'),
+        "description": display_info.get('description', ''),
+        "difficulty": display_info.get('difficulty_level', 'MEDIUM'),
+        "estimated_timeline": display_info.get('estimated_timeline', 'Unknown'),
+        "estimated_cost": display_info.get('estimated_cost', 'Unknown'),
+        "priority": display_info.get('priority', 'MEDIUM'),
+        "tags": display_info.get('tags', []),
+        "step_count": len(flow.get('steps', [])),
+        "recommended_for": display_info.get('recommended_for', ''),
+        "not_for": display_info.get('not_for', ''),
+    }
+
+
+def placeholder_step(step_id: str, order) -> dict:
+    # Step file doesn't exist - create placeholder
+    return {
+        "step_id": step_id,
+        "order": order,
+        "title": f"Step {order}: {step_id}",
+        "description": f"Step file {step_id}.yaml not found",
+        "error": "Step file missing"
+    }
+
+
+def resolve_step_refs(flow: dict, step_hashes: Dict[str, str]) -> List[dict]:
+    """
+    A flow's steps as ordered refs: {"step_id", "order", "hash"}.
+    `hash` is the step's content hash, None when its file is missing.
+    """
+    refs = []
+    for step_ref in flow.get('steps', []):
+        step_id = step_ref.get('step_id')
+        refs.append({
+            "step_id": step_id,
+            "order": step_ref.get('order'),
+            "hash": step_hashes.get(step_id),
+        })
+
+    # Sort by order
+    refs.sort(key=lambda x: x['order'] if x['order'] is not None else 999)
+    return refs
+
+
+def expand_steps(refs: List[dict], store: Dict[str, Any], as_dict) -> List[dict]:
+    """
+    Denormalized steps for a list of refs, with the flow's order merged in.
+    Built as copies so the shared step records stay untouched.
+    """
+    steps = []
+    for ref in refs:
+        if ref["hash"] is None:
+            steps.append(placeholder_step(ref["step_id"], ref["order"]))
+        else:
+            steps.append({**as_dict(store[ref["hash"]]), 'order': ref["order"]})
+    return steps
+
+
+class Catalog:
+    """
+    Read-only snapshot of all flows and steps.
+    Everything a read endpoint needs is derived here, at load time,
+    so request handlers only do dict lookups.
+
+    The YAML dicts are only used while building: response bodies are
+    serialized from them, and what stays in memory for request-time logic
+    are typed, slotted Flow/Step records (app.models). Work done on request
+    from catalog content (delta-sync patches, custom ?fields= projections)
+    starts from each flow's and step's serialized JSON instead.
+    """
+
+    def __init__(
+        self,
+        flows: List[dict],
+        steps_by_id: Dict[str, dict],
+        history: Optional[List[dict]] = None,
+        documents: Optional[Dict[str, dict]] = None,
+    ):
+        # Validate once; a malformed flow or step is reported and left out
+        raw_flows: List[dict] = []
+        self.flows: List[Flow] = []
+        for raw in flows:
+            try:
+                self.flows.append(Flow.from_dict(raw))
+                raw_flows.append(raw)
+            except CatalogValidationError as e:
+                print(f"Error validating {e}")
+        raw_flows_by_id = {f['flow_id']: f for f in raw_flows}
+        self.flows_by_id: Dict[str, Flow] = {f.flow_id: f for f in self.flows}
+        self.flow_summaries = [summarize_flow(f) for f in raw_flows]
+
+        # Steps are interned by content hash: one object per distinct step,
+        # however many flows include it. Flows only hold refs.
+        self.step_hashes: Dict[str, str] = {}
+        raw_step_store: Dict[str, dict] = {}
+        self.step_store: Dict[str, Step] = {}
+        for step_id, raw in steps_by_id.items():
+            h = entity_hash(raw)
+            if h not in self.step_store:
+                try:
+                    self.step_store[h] = Step.from_dict(step_id, raw)
+                except CatalogValidationError as e:
+                    print(f"Error validating {e}")
+                    continue
+                raw_step_store[h] = raw
+            self.step_hashes[step_id] = h
+        self.steps_by_id: Dict[str, Step] = {
+            step_id: self.step_store[h] for step_id, h in self.step_hashes.items()
+        }
+        raw_steps_by_id = {step_id: raw_step_store[h] for step_id, h in self.step_hashes.items()}
+        self.flow_step_refs = {
+            flow_id: resolve_step_refs(flow, self.step_hashes) for flow_id, flow in raw_flows_by_id.items()
+        }
+
+        # step_id -> flows that include it
+        self.step_flows: Dict[str, List[str]] = {}
+        for flow_id, refs in self.flow_step_refs.items():
+            for ref in refs:
+                self.step_flows.setdefault(ref["step_id"], []).append(flow_id)
+
+        # State flags (preconditions/outputs) as bits: a user's progress is one
+        # int and "is this step unlocked" is a single AND (see app.states)
+        self.states = StateRegistry()
+        self.step_masks: Dict[str, Tuple[int, int]] = {
+            step_id: (self.states.mask(step.preconditions), self.states.mask(step.outputs))
+            for step_id, step in self.steps_by_id.items()
+        }
+        # flow_id -> ordered (step_id, precondition_mask, output_mask); missing steps have no flags
+        self.flow_step_masks: Dict[str, List[Tuple[str, int, int]]] = {
+            flow_id: [(ref["step_id"], *self.step_masks.get(ref["step_id"], (0, 0))) for ref in refs]
+            for flow_id, refs in self.flow_step_refs.items()
+        }
+        self.flow_dependencies = {
+            flow_id: FlowDependencies(steps) for flow_id, steps in self.flow_step_masks.items()
+        }
+        # frozenset of flow_ids -> merged plan (see merged_plan)
+        self.merged_plans: Dict[frozenset, Payload] = {}
+        # (flow_id, anchor) -> critical-path schedule, in LRU order (see flow_schedule)
+        self.schedules: OrderedDict[tuple, Payload] = OrderedDict()
+
+        # Document checklist per flow: every document its steps require, once
+        # per canonical id, in the order the flow first needs them
+        self.documents = documents or {}
+        self.document_payloads = {
+            flow_id: Payload(dump_json({"flow_id": flow_id, "documents": self._flow_documents(refs)}))
+            for flow_id, refs in self.flow_step_refs.items()
+        }
+
+        self.search_index = SearchIndex(raw_flows, raw_steps_by_id, self.step_flows)
+        self.facet_index = FacetIndex(raw_flows, self.flow_summaries)
+
+        # Response bodies, serialized and compressed once here instead of on every request
+        self.flows_payload = Payload(dump_json({"flows": self.flow_summaries}))
+        # Per-flow /flows entries, stitched together for filtered listings
+        self.flow_summary_json = [dump_json(summary) for summary in self.flow_summaries]
+        self.facets_payload = Payload(dump_json({"facets": self.facet_index.unfiltered_counts}))
+        self.flow_payloads = {
+            flow_id: Payload(dump_json({
+                "flow": flow, "steps": expand_steps(self.flow_step_refs[flow_id], raw_step_store, dict),
+            }))
+            for flow_id, flow in raw_flows_by_id.items()
+        }
+        # Normalized form: ordered refs plus each step once, keyed by content hash
+        self.normalized_flow_payloads = {
+            flow_id: Payload(dump_json({
+                "flow": flow,
+                "step_refs": self.flow_step_refs[flow_id],
+                "steps": {
+                    ref["hash"]: raw_step_store[ref["hash"]]
+                    for ref in self.flow_step_refs[flow_id] if ref["hash"] is not None
+                },
+            }))
+            for flow_id, flow in raw_flows_by_id.items()
+        }
+        self.summaries_by_id = {s["flow_id"]: s for s in self.flow_summaries}
+
+        # Step index for /step/{step_id} and /steps?ids=...
+        self.step_payloads = {
+            step_id: Payload(dump_json(step)) for step_id, step in raw_steps_by_id.items()
+        }
+        # Each distinct step's body, by content hash (see flow_steps)
+        self.step_bodies: Dict[str, bytes] = {
+            h: self.step_payloads[step_id].body for step_id, h in self.step_hashes.items()
+        }
+
+        # ?fields= presets are built up front; custom field lists on first use
+        self.projected_payloads: Dict[tuple, Payload] = {}
+        for key, selected in FLOWS_PRESETS.items():
+            if selected is not None:
+                self.projected_payloads[("flows", key)] = Payload(
+                    dump_json(project_flows(self.flow_summaries, selected))
+                )
+        for flow_id in self.flows_by_id:
+            for key, selected in FLOW_PRESETS.items():
+                if selected is not None:
+                    self.projected_payloads[("flow", flow_id, key)] = Payload(dump_json(project_flow(
+                        self.summaries_by_id[flow_id],
+                        expand_steps(self.flow_step_refs[flow_id], raw_step_store, dict),
+                        selected,
+                    )))
+
+        # Versioned manifest and delta-sync patches (see app.versioning).
+        # Patches are stitched from each entity's JSON, hashed from the same bytes.
+        self.entity_bodies: Dict[str, Dict[str, bytes]] = {
+            "flows": {flow_id: dump_json(flow) for flow_id, flow in raw_flows_by_id.items()},
+            "steps": {step_id: payload.body for step_id, payload in self.step_payloads.items()},
+        }
+        self.entity_hashes = {
+            "flows": {flow_id: body_hash(body) for flow_id, body in self.entity_bodies["flows"].items()},
+            "steps": self.step_hashes,
+        }
+        self.version = resolve_version(history or [], self.entity_hashes)
+        self.catalog_hash = catalog_hash(self.entity_hashes)
+        self.manifest_payload = Payload(dump_json({
+            "version": self.version,
+            "catalog_hash": self.catalog_hash,
+            **self.entity_hashes,
+        }))
+        # Patches are built on first request: one per recorded version, so
+        # building them all here would grow every cold start with the history
+        self.version_hashes = {v["version"]: v for v in history or []}
+        # Unrecorded content shares its number with any other unrecorded
+        # deploy, so patches from it need the client's catalog hash too
+        self.version_recorded = self.version in self.version_hashes
+        self.version_hashes[self.version] = self.entity_hashes
+        self.version_catalog_hashes = {v: catalog_hash(h) for v, h in self.version_hashes.items()}
+        # since (None = reset) -> patch to the current version
+        self.change_payloads: Dict[Optional[int], Payload] = {}
+
+        # Offline bundle for service-worker precaching: every step is stored
+        # once by content hash; flows reference steps by id (flow["steps"]
+        # refs + order) and step_hashes maps each id to its stored step
+        self.recommendations = recommendation_table(self.flows)
+        self.bundle_payload = Payload(dump_json({
+            "version": self.version,
+            "catalog_hash": self.catalog_hash,
+            "summaries": self.flow_summaries,
+            "flows": raw_flows_by_id,
+            "step_hashes": self.step_hashes,
+            "steps": raw_step_store,
+            "recommendations": self.recommendations,
+        }))
+        self.bundle_hash = hashlib.sha256(self.bundle_payload.body).hexdigest()[:16]
+
+        # Flows each profile can use at all; only these are scored
+        self.eligibility = EligibilityIndex(self.flows, self.recommendations["domains"])
+        # intake_matches weights per question and answer, for both intake models below
+        weights = IntakeWeights(self.flows, self.recommendations["domains"])
+        # Adaptive intake; the empty-form step is what every session starts with
+        self.intake = IntakeModel(self.flows, self.recommendations, weights)
+        self.intake.next_step({})
+        # Live scoring: answer changes update a per-flow score vector
+        self.scorer = IncrementalScorer(self.flows, self.catalog_hash, self.eligibility, weights)
+
+    def _flow_documents(self, refs: List[dict]) -> List[dict]:
+        merged: Dict[str, dict] = {}
+        for ref in refs:
+            step = self.steps_by_id.get(ref["step_id"])
+            if step is None or not step.required_documents:
+                continue
+            for requirement in step.required_documents:
+                entry = merged.get(requirement.id)
+                if entry is None:
+                    info = self.documents.get(requirement.id)
+                    if info is None:
+                        print(f"Unknown document '{requirement.id}' in step {step.step_id}")
+                        info = {}
+                    entry = merged[requirement.id] = {
+                        "id": requirement.id,
+                        "name": info.get('name', requirement.id),
+                        "description": info.get('description'),
+                        "first_needed_by": step.step_id,
+                        "needed_by": [],
+                    }
+                need = {"step_id": step.step_id}
+                if requirement.quantity is not None:
+                    need["quantity"] = requirement.quantity
+                if requirement.notes:
+                    need["notes"] = requirement.notes
+                entry["needed_by"].append(need)
+        return list(merged.values())
+
+    def flow_steps(self, flow_id: str) -> List[dict]:
+        """Denormalized steps of a flow, as /flow/{flow_id} serves them (decoded from the step bodies)"""
+        return expand_steps(self.flow_step_refs[flow_id], self.step_bodies, json.loads)
+
+    def state_mask(self, flags) -> int:
+        """User progress as one int; flags the catalog never mentions are dropped"""
+        return self.states.known_mask(flags)
+
+    def flow_progress(self, flow_id: str, completed: List[str], flags: List[str]) -> Optional[dict]:
+        """
+        Where a user stands in a flow: done, unlocked (can be done now) and
+        blocked steps, with the flags each blocked step still needs.
+        None if no such flow.
+        """
+        deps = self.flow_dependencies.get(flow_id)
+        if deps is None:
+            return None
+        done, unlocked, blocked, state = deps.progress(completed, self.state_mask(flags))
+        steps = deps.steps
+        return {
+            "flow_id": flow_id,
+            "completed": [steps[i][0] for i in bit_positions(done)],
+            "unlocked": [steps[i][0] for i in bit_positions(unlocked)],
+            "blocked": [
+                {"step_id": steps[i][0], "missing": self.states.flags(steps[i][1] & ~state)}
+                for i in bit_positions(blocked)
+            ],
+            "remaining": [steps[i][0] for i in bit_positions(unlocked | blocked)],
+            "flow_complete": not blocked and not unlocked,
+        }
+
+    def merged_plan(self, flow_ids: List[str]) -> Payload:
+        """
+        One deduplicated, dependency-ordered plan for several flows, e.g.
+        family reunification + employee. Flows are merged in catalog order,
+        so the same set gives the same plan whatever order it was asked in.
+        Caller checks the flow_ids exist.
+        """
+        key = frozenset(flow_ids)
+        payload = self.merged_plans.get(key)
+        metrics.cache_lookup("merged_plans", payload is not None)
+        if payload is not None:
+            return payload
+
+        ordered = [flow_id for flow_id in self.flows_by_id if flow_id in key]
+        waves, external, unresolved = merge_flows([self.flow_step_masks[f] for f in ordered])
+        steps = []
+        for wave_number, wave in enumerate(waves, 1):
+            for step_id in wave:
+                step = self.steps_by_id.get(step_id)
+                steps.append({
+                    "step_id": step_id,
+                    "title": step.title if step else None,
+                    "wave": wave_number,
+                    "flows": [f for f in self.step_flows.get(step_id, []) if f in key],
+                })
+        payload = Payload(dump_json({
+            "flows": ordered,
+            "steps": steps,
+            "external_flags": self.states.flags(external),
+            "unresolved": unresolved,
+        }))
+        if len(self.merged_plans) < MAX_MERGED_PLANS:
+            self.merged_plans[key] = payload
+        return payload
+
+    def change_payload(self, since: Optional[int], since_hash: Optional[str] = None) -> Payload:
+        """
+        Patch from catalog version `since` to this one. An unknown or future
+        `since` (or none) gets the reset patch: the client starts over from
+        everything. So does a `since_hash` (the client's catalog hash) that
+        isn't that version's, or none for the unrecorded current version.
+        """
+        if since not in self.version_hashes:
+            since = None
+        elif since_hash is not None:
+            if since_hash != self.version_catalog_hashes[since]:
+                since = None
+        elif since == self.version and not self.version_recorded:
+            since = None
+        payload = self.change_payloads.get(since)
+        metrics.cache_lookup("change_payloads", payload is not None)
+        if payload is None:
+            payload = self.change_payloads[since] = Payload(build_patch(
+                since, self.version_hashes.get(since), self.version, self.entity_hashes, self.entity_bodies,
+            ))
+        return payload
+
+    def flow_schedule(self, flow_id: str, anchor: date) -> Optional[Payload]:
+        """Earliest/latest dates and slack of every step from `anchor`, None if no such flow"""
+        if flow_id not in self.flow_step_masks:
+            return None
+        key = (flow_id, anchor)
+        payload = self.schedules.get(key)
+        metrics.cache_lookup("schedules", payload is not None)
+        if payload is not None:
+            self.schedules.move_to_end(key)
+            return payload
+
+        schedule = schedule_flow(self.flow_step_masks[flow_id], self.steps_by_id, self.states, anchor)
+        payload = self.schedules[key] = Payload(dump_json({"flow_id": flow_id, **schedule}))
+        if len(self.schedules) > MAX_SCHEDULES:
+            self.schedules.popitem(last=False)
+        return payload
+
+    def _projected(self, cache_key: tuple, build) -> Payload:
+        payload = self.projected_payloads.get(cache_key)
+        metrics.cache_lookup("projections", payload is not None)
+        if payload is None:
+            payload = Payload(dump_json(build()))
+            if len(self.projected_payloads) < MAX_CUSTOM_PROJECTIONS:
+                self.projected_payloads[cache_key] = payload
+        return payload
+
+    def flows_projection(self, key: str, selected: Optional[tuple]) -> Payload:
+        """GET /flows body for a parsed ?fields= value"""
+        if selected is None:
+            return self.flows_payload
+        return self._projected(("flows", key), lambda: project_flows(self.flow_summaries, selected))
+
+    def filtered_flows_body(self, selected_facets: Dict[str, List[str]], selected: Optional[tuple]) -> bytes:
+        """GET /flows body with facet filters: matching flows, total and facet counts"""
+        indexes = bit_positions(self.facet_index.filter(selected_facets))
+        if selected is None:
+            flows_json = b"[" + b",".join(self.flow_summary_json[i] for i in indexes) + b"]"
+        else:
+            flows_json = dump_json(
+                project_flows([self.flow_summaries[i] for i in indexes], selected)["flows"]
+            )
+        return (
+            b'{"flows":' + flows_json
+            + b',"total":' + str(len(indexes)).encode()
+            + b',"facets":' + dump_json(self.facet_index.counts(selected_facets)) + b'}'
+        )
+
+    def flow_projection(self, flow_id: str, key: str, selected: Optional[tuple]) -> Optional[Payload]:
+        """GET /flow/{flow_id} body for a parsed ?fields= value, None if no such flow"""
+        if flow_id not in self.flows_by_id:
+            return None
+        if selected is None:
+            return self.flow_payloads[flow_id]
+        return self._projected(
+            ("flow", flow_id, key),
+            lambda: project_flow(self.summaries_by_id[flow_id], self.flow_steps(flow_id), selected),
+        )
+
+
+def build_catalog(
+    flows_dir: Path = FLOWS_DIR,
+    steps_dir: Path = STEPS_DIR,
+    history_path: Path = HISTORY_PATH,
+) -> Catalog:
+    """Blocking: reads every YAML file. Never call this on the event loop."""
+    return Catalog(
+        load_all_flows(flows_dir), load_all_steps(steps_dir), load_history(history_path), load_documents(),
+    )
+
+
+_catalog: Optional[Catalog] = None
+_catalog_lock = threading.Lock()
+
+
+def reload_catalog() -> Catalog:
+    """Rebuild the catalog from disk and swap it in (blocking)"""
+    global _catalog
+    start = time.perf_counter()
+    catalog = build_catalog()
+    metrics.catalog_loaded("reload", time.perf_counter() - start)
+    with _catalog_lock:
+        _catalog = catalog
+    return catalog
+
+
+def _load_once() -> Catalog:
+    # Concurrent cold requests wait for a single load instead of each reading YAML
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            start = time.perf_counter()
+            _catalog = build_catalog()
+            metrics.catalog_loaded("cold", time.perf_counter() - start)
+        return _catalog
+
+
+def get_catalog_sync() -> Catalog:
+    """Catalog for blocking callers (scripts, benchmarks)"""
+    return _catalog if _catalog is not None else _load_once()
+
+
+async def get_catalog() -> Catalog:
+    """
+    Catalog for async handlers. The warm path is a plain attribute read;
+    only a cold load is pushed to the worker thread pool.
+    """
+    catalog = _catalog
+    if catalog is None:
+        catalog = await run_in_threadpool(_load_once)
+    return catalog
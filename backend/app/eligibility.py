@@ -0,0 +1,94 @@
+# backend/app/eligibility.py
+# Eligibility pre-filter - flows the profile can't legally use are never scored
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.models import Flow
+from app.states import bit_positions
+
+# Eligibility value meaning "no restriction" (same as leaving the field out)
+ELIGIBLE_ANY = "ANY"
+
+# Non-EU answers also satisfy flows written for all non-EU nationals
+NATIONALITY_GROUPS = {"NON_EU_VISA_FREE": "NON_EU", "NON_EU_VISA_REQUIRED": "NON_EU"}
+# visit_purpose answers that name a lifecycle phase rather than a purpose
+PURPOSE_PHASES = {"PERMANENT": "PERMANENT", "CITIZENSHIP": "CITIZENSHIP"}
+# requires_visa values a nationality can use. Visa-free non-EU nationals
+# still need a national visa for long stays, so they aren't restricted.
+NATIONALITY_VISA = {"EU": (False,), "NON_EU_VISA_REQUIRED": (True,)}
+
+# Eligibility field -> (intake question, answer -> eligibility values that admit it).
+# None = this answer doesn't restrict the field.
+ELIGIBILITY_RULES: Dict[str, Tuple[str, Callable[[str], Optional[Sequence[Any]]]]] = {
+    "nationality": ("nationality_type", lambda a: (a, NATIONALITY_GROUPS.get(a, a))),
+    "current_location": ("current_location", lambda a: (a,)),
+    "purpose": ("visit_purpose", lambda a: (a,)),
+    "lifecycle_phase": ("visit_purpose", lambda a: (PURPOSE_PHASES[a],) if a in PURPOSE_PHASES else None),
+    "requires_visa": ("nationality_type", NATIONALITY_VISA.get),
+    "urgency": ("urgency_level", lambda a: (a,)),
+}
+
+
+def _values(value: Any) -> Tuple[Any, ...]:
+    return tuple(value) if isinstance(value, (list, tuple)) else (value,)
+
+
+class EligibilityIndex:
+    """
+    Inverted index over flows' eligibility blocks: per field, a bitmap of
+    the flows declaring each value (bit i = i-th flow), plus the flows that
+    don't restrict the field at all. A profile's candidates are the AND of
+    one OR-ed bitmap per answered field, so ruling flows out never looks
+    at the flows themselves.
+
+    Only answers some flow's intake_matches lists (`domains`) restrict
+    anything - an unrecognised answer is treated like no answer, the same
+    way scoring treats it.
+    """
+
+    def __init__(self, flows: List[Flow], domains: Dict[str, List[Optional[str]]]):
+        self.flows = flows
+        self.all_mask = (1 << len(flows)) - 1
+        self.known = {question: set(domains.get(question, ())) - {None} for question, _ in ELIGIBILITY_RULES.values()}
+        self.bitmaps: Dict[str, Dict[Any, int]] = {field: {} for field in ELIGIBILITY_RULES}
+        self.unrestricted: Dict[str, int] = {field: 0 for field in ELIGIBILITY_RULES}
+
+        for i, flow in enumerate(flows):
+            for field in ELIGIBILITY_RULES:
+                value = flow.eligibility.get(field)
+                if value is None or ELIGIBLE_ANY in _values(value):
+                    self.unrestricted[field] |= 1 << i
+                    continue
+                for v in _values(value):
+                    self.bitmaps[field][v] = self.bitmaps[field].get(v, 0) | (1 << i)
+
+        # Flows an answer to each question could still rule out
+        self.restricted_by: Dict[str, int] = {}
+        for field, (question, _) in ELIGIBILITY_RULES.items():
+            restricted = self.all_mask ^ self.unrestricted[field]
+            self.restricted_by[question] = self.restricted_by.get(question, 0) | restricted
+
+    def candidates(self, answers: Dict[str, Optional[str]]) -> int:
+        """Bitmap of flows these answers don't rule out"""
+        mask = self.all_mask
+        for field, (question, admitted) in ELIGIBILITY_RULES.items():
+            answer = answers.get(question)
+            if answer not in self.known[question]:
+                continue
+            values = admitted(answer)
+            if values is None:
+                continue
+            field_mask = self.unrestricted[field]
+            for v in values:
+                field_mask |= self.bitmaps[field].get(v, 0)
+            mask &= field_mask
+        # A profile no flow fits (e.g. permanent residence from abroad) gets
+        # every flow scored rather than no recommendation at all
+        return mask or self.all_mask
+
+    def eligible(self, answers: Dict[str, Optional[str]]) -> List[Flow]:
+        """Candidate flows, in catalog order"""
+        mask = self.candidates(answers)
+        if mask == self.all_mask:
+            return self.flows
+        return [self.flows[i] for i in bit_positions(mask)]
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Static API export - render the read-only API to files for S3/CloudFront.
+
+Drives the real FastAPI routes in-process (plain ASGI calls, no server),
+so the files are byte-for-byte what the Lambda would have returned.
+
+Layout (every data file is content-hashed, only manifest.json is mutable):
+    manifest.json                  route -> file map, catalog hash
+    flows.<hash>.json              GET /flows
+    flow/<flow_id>.<hash>.json     GET /flow/{flow_id}
+    step/<step_id>.<hash>.json     GET /step/{step_id}
+    recommendations.<hash>.json    POST /recommend-flow-v2 for every distinct intake
+
+Usage (from backend/):
+    python -m app.export --out ../dist/api
+    python -m app.export --out ../dist/api --verify
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+
+from app.catalog import get_catalog
+from app.main import app
+from app.models import Flow
+from app.scoring import intake_answer_domains, iter_intakes, recommendation_key
+
+MANIFEST_NAME = "manifest.json"
+
+
+async def asgi_request(method: str, path: str, body: Optional[bytes] = None) -> Tuple[int, bytes]:
+    """Call the app directly over ASGI and return (status, body)"""
+    path, _, query = path.partition("?")
+    headers = [(b"host", b"export"), (b"accept-encoding", b"identity")]
+    if body is not None:
+        headers.append((b"content-type", b"application/json"))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 0),
+        "server": ("export", 80),
+    }
+    request_body = body or b""
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": request_body, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    status = 0
+    chunks = []
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+
+async def get_ok(path: str) -> bytes:
+    status, body = await asgi_request("GET", path)
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}")
+    return body
+
+
+async def render_recommendations(flows: List[Flow]) -> bytes:
+    """
+    Exhaustive recommendation table, same layout as
+    scoring.recommendation_table but produced by calling the live route.
+    """
+    domains = intake_answer_domains(flows)
+    questions = list(domains)
+    results: List[dict] = []
+    result_index: Dict[bytes, int] = {}
+    table: Dict[str, int] = {}
+
+    for answers in iter_intakes(domains):
+        payload = json.dumps({k: v for k, v in answers.items() if v is not None}).encode()
+        status, body = await asgi_request("POST", "/recommend-flow-v2", payload)
+        if status != 200:
+            raise RuntimeError(f"POST /recommend-flow-v2 {answers} returned {status}")
+        if body not in result_index:
+            result_index[body] = len(results)
+            results.append(json.loads(body))
+        table[recommendation_key(answers, questions)] = result_index[body]
+
+    return json.dumps(
+        {"questions": questions, "domains": domains, "results": results, "table": table},
+        ensure_ascii=False, separators=(",", ":"), sort_keys=True,
+    ).encode("utf-8")
+
+
+async def render_api() -> Dict[str, bytes]:
+    """Route -> response body for the whole read-only API"""
+    catalog = await get_catalog()
+    rendered = {"/flows": await get_ok("/flows")}
+    for summary in json.loads(rendered["/flows"])["flows"]:
+        route = f"/flow/{summary['flow_id']}"
+        rendered[route] = await get_ok(route)
+    for step_id in catalog.steps_by_id:
+        route = f"/step/{step_id}"
+        rendered[route] = await get_ok(route)
+    rendered["/recommendations"] = await render_recommendations(catalog.flows)
+    return rendered
+
+
+def content_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:12]
+
+
+def file_for_route(route: str, body: bytes) -> str:
+    stem = route.strip("/")
+    return f"{stem}.{content_hash(body)}.json"
+
+
+def build_manifest(rendered: Dict[str, bytes]) -> dict:
+    routes = {route: file_for_route(route, body) for route, body in sorted(rendered.items())}
+    catalog_hash = hashlib.sha256("\n".join(routes.values()).encode()).hexdigest()[:16]
+    return {"catalog_hash": catalog_hash, "routes": routes}
+
+
+def write_export(out_dir: Path, rendered: Dict[str, bytes]) -> dict:
+    manifest = build_manifest(rendered)
+    for route, filename in manifest["routes"].items():
+        target = out_dir / filename
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(rendered[route])
+    # Written last, so a reader never sees a manifest pointing at missing files
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return manifest
+
+
+def verify_export(out_dir: Path, rendered: Dict[str, bytes]) -> List[str]:
+    """Diff an export directory against live route output; returns problems"""
+    manifest_path = out_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return [f"{manifest_path} not found"]
+    routes = json.loads(manifest_path.read_text(encoding="utf-8"))["routes"]
+
+    problems = []
+    for route in sorted(set(routes) - set(rendered)):
+        problems.append(f"{route}: exported but no longer served")
+    for route in sorted(set(rendered) - set(routes)):
+        problems.append(f"{route}: served but missing from export")
+    for route in sorted(set(rendered) & set(routes)):
+        path = out_dir / routes[route]
+        if not path.exists():
+            problems.append(f"{route}: file {routes[route]} missing")
+        elif path.read_bytes() != rendered[route]:
+            problems.append(f"{route}: {routes[route]} differs from live output")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export the read-only API as static files")
+    parser.add_argument("--out", type=Path, required=True, help="Output directory")
+    parser.add_argument("--verify", action="store_true", help="Compare an existing export with live output")
+    args = parser.parse_args(argv)
+
+    rendered = asyncio.run(render_api())
+
+    if args.verify:
+        problems = verify_export(args.out, rendered)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            return 1
+        print(f"✅ {len(rendered)} routes match {args.out}")
+        return 0
+
+    manifest = write_export(args.out, rendered)
+    print(f"✅ Exported {len(manifest['routes'])} routes to {args.out} (catalog {manifest['catalog_hash']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
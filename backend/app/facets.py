@@ -0,0 +1,81 @@
+# backend/app/facets.py
+# Faceted filtering of /flows - posting bitmaps built at catalog load
+
+from typing import Optional, List, Dict
+
+FACETS = ("category", "tag", "difficulty", "priority", "lifecycle_phase")
+
+
+def flow_facet_values(flow: dict, summary: dict) -> Dict[str, List[str]]:
+    """Facet values of one flow (tag is multi-valued)"""
+    eligibility = flow.get('eligibility') or {}
+    intake_routing = flow.get('intake_routing') or {}
+    lifecycle_phase = eligibility.get('lifecycle_phase') or intake_routing.get('lifecycle_phase')
+    return {
+        "category": [summary["category"]],
+        "tag": [str(t) for t in summary["tags"] or []],
+        "difficulty": [summary["difficulty"]],
+        "priority": [summary["priority"]],
+        "lifecycle_phase": [lifecycle_phase] if lifecycle_phase else [],
+    }
+
+
+class FacetIndex:
+    """
+    For every facet value, an int bitmap of the flows that have it
+    (bit i = i-th flow). Filtering is AND across facets, OR within one;
+    counts are popcounts of bitmap intersections, so neither touches
+    individual flows.
+    """
+
+    def __init__(self, flows: List[dict], summaries: List[dict]):
+        self.size = len(flows)
+        self.all_mask = (1 << self.size) - 1
+        # facet -> folded value -> bitmap; display keeps the original spelling
+        self.bitmaps: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+        self.display: Dict[str, Dict[str, str]] = {facet: {} for facet in FACETS}
+
+        for i, (flow, summary) in enumerate(zip(flows, summaries)):
+            for facet, values in flow_facet_values(flow, summary).items():
+                for value in values:
+                    key = value.casefold()
+                    self.bitmaps[facet][key] = self.bitmaps[facet].get(key, 0) | (1 << i)
+                    self.display[facet].setdefault(key, value)
+
+        self.unfiltered_counts = self.counts({})
+
+    def facet_mask(self, facet: str, values: List[str]) -> int:
+        mask = 0
+        for value in values:
+            mask |= self.bitmaps[facet].get(value.casefold(), 0)
+        return mask
+
+    def filter(self, selected: Dict[str, List[str]]) -> int:
+        """Bitmap of flows matching every selected facet"""
+        mask = self.all_mask
+        for facet, values in selected.items():
+            mask &= self.facet_mask(facet, values)
+        return mask
+
+    def counts(self, selected: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
+        """
+        Per facet value, how many flows would match if it were chosen.
+        Each facet is counted against the other facets' filters only, so
+        picking one category still shows counts for the other categories.
+        """
+        masks = {facet: self.facet_mask(facet, values) for facet, values in selected.items()}
+        counts = {}
+        for facet in FACETS:
+            others = self.all_mask
+            for other, mask in masks.items():
+                if other != facet:
+                    others &= mask
+            counts[facet] = {
+                self.display[facet][key]: (bitmap & others).bit_count()
+                for key, bitmap in sorted(self.bitmaps[facet].items())
+            }
+        return counts
+
+
+def selected_facets(**values: Optional[List[str]]) -> Dict[str, List[str]]:
+    return {facet: v for facet, v in values.items() if v}
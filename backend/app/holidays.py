@@ -0,0 +1,65 @@
+# backend/app/holidays.py
+# Slovak public holidays and working-day arithmetic for deadlines
+
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import FrozenSet
+
+# Fixed-date public holidays and days of rest (Act No. 241/1993 Coll.), as (month, day)
+FIXED_HOLIDAYS = (
+    (1, 1),    # Day of the Establishment of the Slovak Republic
+    (1, 6),    # Epiphany
+    (5, 1),    # Labour Day
+    (5, 8),    # Day of Victory over Fascism
+    (7, 5),    # St. Cyril and Methodius Day
+    (8, 29),   # Slovak National Uprising Anniversary
+    (9, 1),    # Constitution Day
+    (9, 15),   # Our Lady of Seven Sorrows
+    (11, 1),   # All Saints' Day
+    (11, 17),  # Struggle for Freedom and Democracy Day
+    (12, 24),  # Christmas Eve
+    (12, 25),  # Christmas Day
+    (12, 26),  # St. Stephen's Day
+)
+
+
+def easter_sunday(year: int) -> date:
+    """Gregorian Easter (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+@lru_cache(maxsize=64)
+def holidays(year: int) -> FrozenSet[date]:
+    easter = easter_sunday(year)
+    return frozenset(
+        [date(year, month, day) for month, day in FIXED_HOLIDAYS]
+        + [easter - timedelta(days=2), easter + timedelta(days=1)]  # Good Friday, Easter Monday
+    )
+
+
+def is_working_day(day: date) -> bool:
+    return day.weekday() < 5 and day not in holidays(day.year)
+
+
+def add_working_days(start: date, days: int) -> date:
+    """
+    The date `days` working days after `start` ("within 3 working days"),
+    stepping backwards for negative `days`.
+    """
+    step = timedelta(days=1 if days >= 0 else -1)
+    day = start
+    for _ in range(abs(days)):
+        day += step
+        while not is_working_day(day):
+            day += step
+    return day
@@ -0,0 +1,141 @@
+# backend/app/incremental.py
+# Incremental intake scoring - an answer change only touches that question's weights
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.eligibility import EligibilityIndex
+from app.models import Flow
+from app.scoring import (
+    INTAKE_QUESTIONS, IntakeWeights, calculate_flow_match_score, confidence_level, pick_flow, score_flow, to_recommendation,
+)
+from app.states import bit_positions
+
+# Signs state tokens so a client can't hand back a doctored score vector.
+# Without a configured secret each process uses its own; a token from
+# another process (or an older catalog) is then rebuilt from its answers.
+TOKEN_SECRET = os.environ.get("SCORE_TOKEN_SECRET", "").encode() or os.urandom(32)
+
+
+class StateTokenError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreState:
+    # One answer per INTAKE_QUESTIONS entry, None = unanswered
+    answers: Tuple[Optional[str], ...]
+    # Matched intake_matches weight per flow, in catalog order
+    matched: Tuple[float, ...]
+
+    def answers_dict(self) -> Dict[str, str]:
+        return {q: a for q, a in zip(INTAKE_QUESTIONS, self.answers) if a is not None}
+
+
+class IncrementalScorer:
+    """
+    Keeps each flow's matched weight as a vector. Changing one answer
+    subtracts the old answer's contribution for that question and adds the
+    new one's - the other questions are never looked at.
+
+    Scores come out identical to calculate_flow_match_score: matched
+    weights are summed exactly (all catalog weights are integers), and the
+    score is the same matched / total * 100 expression. A flow with a
+    non-integer weight, where summation order could change the last bit,
+    is rescored in full instead.
+    """
+
+    def __init__(self, flows: List[Flow], catalog_hash: str, eligibility: EligibilityIndex, weights: IntakeWeights):
+        self.flows = flows
+        self.catalog_hash = catalog_hash
+        self.eligibility = eligibility
+        self.weights = weights
+        self.exact = [all(isinstance(m.weight, int) for m in f.intake_matches) for f in flows]
+
+        # "Any answer" matches count whatever is answered
+        matched = weights.base
+        for q in INTAKE_QUESTIONS:
+            matched = tuple(a + b for a, b in zip(matched, weights.contribution(q, None)))
+        self.initial = ScoreState((None,) * len(INTAKE_QUESTIONS), matched)
+
+    def apply(self, state: ScoreState, question: str, answer: Optional[str]) -> ScoreState:
+        """State after (re)answering one question; None clears it"""
+        i = INTAKE_QUESTIONS.index(question)
+        old = state.answers[i]
+        if old == answer:
+            return state
+        removed, added = self.weights.contribution(question, old), self.weights.contribution(question, answer)
+        matched = tuple(m - r + a for m, r, a in zip(state.matched, removed, added))
+        answers = state.answers[:i] + (answer,) + state.answers[i + 1:]
+        return ScoreState(answers, matched)
+
+    def from_answers(self, answers: Dict[str, Optional[str]]) -> ScoreState:
+        state = self.initial
+        for q, a in answers.items():
+            state = self.apply(state, q, a)
+        return state
+
+    def scores(self, state: ScoreState) -> List[float]:
+        out = []
+        answers = None
+        for flow, matched, exact in zip(self.flows, state.matched, self.exact):
+            if not flow.intake_matches or flow.total_weight == 0:
+                out.append(0.0)
+            elif exact:
+                out.append((matched / flow.total_weight) * 100)
+            else:
+                answers = answers if answers is not None else state.answers_dict()
+                out.append(calculate_flow_match_score(flow, answers)[0])
+        return out
+
+    def result(self, state: ScoreState) -> dict:
+        """Same recommendation /recommend-flow-v2 gives for these answers, plus every flow's score and eligibility"""
+        scores = self.scores(state)
+        answers = state.answers_dict()
+        eligible = bit_positions(self.eligibility.candidates(answers))
+        best = pick_flow(dict(enumerate(scores)), eligible)
+        eligible = set(eligible)
+        return {
+            "recommendation": to_recommendation(score_flow(self.flows[best], answers)) if best is not None else None,
+            "scores": {
+                f.flow_id: {
+                    "score": s,
+                    "confidence": confidence_level(s, f.confidence_threshold),
+                    "eligible": i in eligible,
+                }
+                for i, (f, s) in enumerate(zip(self.flows, scores))
+            },
+        }
+
+    def _sign(self, payload: bytes) -> str:
+        return hmac.new(TOKEN_SECRET, payload, hashlib.sha256).hexdigest()[:32]
+
+    def encode(self, state: ScoreState) -> str:
+        """Opaque state token: answers, score vector and catalog, signed"""
+        payload = base64.urlsafe_b64encode(json.dumps(
+            {"c": self.catalog_hash, "a": state.answers, "m": state.matched}, separators=(",", ":"),
+        ).encode()).decode()
+        return f"{payload}.{self._sign(payload.encode())}"
+
+    def decode(self, token: str) -> ScoreState:
+        """
+        State from a token. A valid token's vector is used as is; one signed
+        elsewhere or for another catalog version is rebuilt from its answers.
+        """
+        try:
+            payload, signature = token.rsplit(".", 1)
+            data = json.loads(base64.urlsafe_b64decode(payload.encode()))
+            answers = tuple(data["a"])
+            if len(answers) != len(INTAKE_QUESTIONS) or not all(a is None or isinstance(a, str) for a in answers):
+                raise ValueError("bad answers")
+        except (ValueError, KeyError, TypeError) as e:
+            raise StateTokenError(f"Invalid state token: {e}")
+
+        if hmac.compare_digest(signature, self._sign(payload.encode())) and data.get("c") == self.catalog_hash:
+            return ScoreState(answers, tuple(data["m"]))
+        return self.from_answers(dict(zip(INTAKE_QUESTIONS, answers)))
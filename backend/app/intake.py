@@ -0,0 +1,168 @@
+# backend/app/intake.py
+# Adaptive intake - ask only the questions that can still change the recommendation
+
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+from app.metrics import metrics
+from app.models import Flow
+from app.scoring import IntakeWeights, recommendation_key
+
+# next_step results are memoized per partial answer set, up to this many
+MAX_INTAKE_STATES = 4096
+
+
+class IntakeModel:
+    """
+    Compiled from every flow's intake_matches at catalog load.
+
+    The exhaustive recommendation table answers "is the top flow already
+    decided?"; the per-question weight vectors (IntakeWeights, shared with
+    live scoring) pick the question that best separates the flows still
+    in contention.
+    """
+
+    def __init__(self, flows: List[Flow], recommendations: dict, weights: IntakeWeights):
+        self.flows = flows
+        self.questions: List[str] = recommendations["questions"]
+        self.domains: Dict[str, List[Optional[str]]] = recommendations["domains"]
+        self.table: Dict[str, int] = recommendations["table"]
+        self.results: List[dict] = recommendations["results"]
+        self.base = weights.base
+        self.contributions = weights.contributions
+
+        # Partial answers (domain-normalized) -> next_step result
+        self._steps: Dict[Tuple, dict] = {}
+
+    def normalize(self, answers: Dict[str, Optional[str]]) -> Tuple[Dict[str, Optional[str]], List[str]]:
+        """
+        Answers as table values (an answer no flow asks for scores like
+        no answer, so it becomes None) and the questions still unanswered.
+        """
+        normalized, unanswered = {}, []
+        for q in self.questions:
+            value = answers.get(q)
+            if value is None:
+                unanswered.append(q)
+            normalized[q] = value if value in self.domains[q] else None
+        return normalized, unanswered
+
+    def current(self, normalized: Dict[str, Optional[str]]) -> Optional[dict]:
+        """What /recommend-flow-v2 returns for these answers"""
+        index = self.table.get(recommendation_key(normalized, self.questions))
+        return self.results[index] if index is not None else None
+
+    def decided(self, normalized: Dict[str, Optional[str]], unanswered: List[str]) -> Optional[int]:
+        """
+        Result index if every way of answering the remaining questions
+        recommends the same flow, else None. Stops at the first disagreement.
+        """
+        flow_id = None
+        agreed = True
+        completion = dict(normalized)
+        for combo in itertools.product(*(self.domains[q] for q in unanswered)):
+            completion.update(zip(unanswered, combo))
+            index = self.table.get(recommendation_key(completion, self.questions))
+            if index is None:
+                continue
+            if flow_id is None:
+                flow_id = self.results[index]["flow_id"]
+            elif self.results[index]["flow_id"] != flow_id:
+                agreed = False
+                break
+
+        current = self.table.get(recommendation_key(normalized, self.questions))
+        return current if agreed and current is not None else None
+
+    def in_contention(self, normalized: Dict[str, Optional[str]], unanswered: List[str]) -> List[int]:
+        """
+        Flows that could still come out on top: their best possible score
+        reaches the worst possible score of the current leader. Eligibility
+        only breaks ties (see scoring.recommend), so no flow is ruled out
+        by it here.
+        """
+        lows, highs = {}, {}
+        for i in range(len(self.flows)):
+            flow = self.flows[i]
+            if not flow.total_weight:
+                lows[i] = highs[i] = 0.0
+                continue
+            fixed = self.base[i] + sum(
+                self.contributions[q][normalized[q]][i] for q in self.questions if q not in unanswered
+            )
+            low = fixed + sum(min(v[i] for v in self.contributions[q].values()) for q in unanswered)
+            high = fixed + sum(max(v[i] for v in self.contributions[q].values()) for q in unanswered)
+            lows[i] = low / flow.total_weight * 100
+            highs[i] = high / flow.total_weight * 100
+        floor = max(lows.values(), default=0.0)
+        return [i for i in highs if highs[i] >= floor]
+
+    def separation(self, question: str, contenders: List[int]) -> float:
+        """
+        Expected spread of score changes among the contenders if `question`
+        is answered, averaged over its answers (any other answer = None)
+        """
+        spreads = []
+        for weights in self.contributions[question].values():
+            deltas = [
+                weights[i] / self.flows[i].total_weight * 100 if self.flows[i].total_weight else 0.0
+                for i in contenders
+            ]
+            spreads.append(max(deltas) - min(deltas))
+        return sum(spreads) / len(spreads)
+
+    def expected_contenders(self, question: str, normalized: Dict[str, Optional[str]], unanswered: List[str]) -> float:
+        """Average size of the contention set once `question` is answered"""
+        rest = [q for q in unanswered if q != question]
+        sizes = [
+            len(self.in_contention({**normalized, question: value}, rest))
+            for value in self.domains[question]
+        ]
+        return sum(sizes) / len(sizes)
+
+    def next_step(self, answers: Dict[str, Optional[str]]) -> dict:
+        """
+        A recommendation once no remaining answer can change the top flow,
+        otherwise the most discriminating question: the one expected to
+        leave the fewest flows in contention, then the widest score
+        separation among them. Questions no flow lists an answer for are
+        never asked; with none left to ask and no recommendation for these
+        answers, the result is "no_match".
+        """
+        normalized, unanswered = self.normalize(answers)
+        # ... marks an unanswered question (None is a real "no match" answer)
+        memo_key = tuple(... if q in unanswered else normalized[q] for q in self.questions)
+        step = self._steps.get(memo_key)
+        metrics.cache_lookup("intake_steps", step is not None)
+        if step is not None:
+            return step
+
+        decided = self.decided(normalized, unanswered)
+        askable = [q for q in unanswered if any(v is not None for v in self.domains[q])]
+        if decided is not None:
+            step = {
+                "status": "recommendation",
+                "recommendation": self.results[decided],
+                "questions_answered": len(self.questions) - len(unanswered),
+            }
+        elif not askable:
+            step = {
+                "status": "no_match",
+                "recommendation": None,
+                "questions_answered": len(self.questions) - len(unanswered),
+            }
+        else:
+            contenders = self.in_contention(normalized, unanswered)
+            question = min(askable, key=lambda q: (
+                self.expected_contenders(q, normalized, unanswered), -self.separation(q, contenders),
+            ))
+            step = {
+                "status": "question",
+                "question": question,
+                "options": [v for v in self.domains[question] if v is not None],
+                "in_contention": [self.flows[i].flow_id for i in contenders],
+                "current": self.current(normalized),
+            }
+        if len(self._steps) < MAX_INTAKE_STATES:
+            self._steps[memo_key] = step
+        return step
@@ -1,15 +1,38 @@
 # backend/app/main.py
 # FIXED VERSION - Robust scoring that doesn't crash on bad data
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from datetime import date
+
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
-import yaml
-import os
-from pathlib import Path
+from starlette.concurrency import run_in_threadpool
+
+from app.catalog import get_catalog, reload_catalog
+from app.projections import (
+    FLOW_PRESETS, FLOWS_PRESETS, FLOW_SUMMARY_FIELDS, STEP_FIELDS, ProjectionError, parse_fields,
+)
+from app.facets import selected_facets
+from app.incremental import StateTokenError
+from app.metrics import MetricsMiddleware, metrics
+from app.profiling import PROFILING_ENABLED, ProfilingMiddleware
+from app.timing import TIMING_ENABLED, ServerTimingMiddleware, span
+from app.schengen import StayError, calculate_stay
+from app.scoring import INTAKE_QUESTIONS, recommend, to_recommendation
+from app.responses import PrebuiltJSONResponse, dump_json, etag_matches, make_etag, not_modified
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the catalog before the first request (uvicorn). On Lambda the
+    # lifespan is off, so the first request does the cold load instead.
+    await run_in_threadpool(reload_catalog)
+    yield
+
 
-app = FastAPI(title="Simplify Slovakia API")
+app = FastAPI(title="Simplify Slovakia API", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -19,11 +42,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-# Paths
-BASE_DIR = Path(__file__).parent.parent.parent  # backend/app -> backend -> project root
-FLOWS_DIR = BASE_DIR / "data" / "flows"
-STEPS_DIR = BASE_DIR / "data" / "steps"
+# Request profiling, only when PROFILE_TOKEN or PROFILE_SAMPLE_RATE is set
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+# Server-Timing phase breakdown, only when SERVER_TIMING=1
+if TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+# Per-route latency and status counts (added last = outermost, so the time
+# of every other middleware is included)
+app.add_middleware(MetricsMiddleware)
 
 # Models
 class IntakeAnswersV2(BaseModel):
@@ -42,166 +69,291 @@ class FlowRecommendation(BaseModel):
     score: float
     reason: Optional[str] = None
 
-# Load flows
-def load_all_flows():
-    flows = []
-    if not FLOWS_DIR.exists():
-        return flows
-    
-    for yaml_file in FLOWS_DIR.glob("*.yaml"):
-        try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                flow = yaml.safe_load(f)
-                if flow:
-                    flows.append(flow)
-        except Exception as e:
-            print(f"Error loading {yaml_file}: {e}")
+class FlowProgressRequest(BaseModel):
+    completed_steps: List[str] = []
+    state_flags: List[str] = []
+
+class SchengenStay(BaseModel):
+    entry: date
+    exit: date
+
+class StayCalculatorRequest(BaseModel):
+    stays: List[SchengenStay] = []
+    on: Optional[date] = None  # defaults to today
+    planned_entry: Optional[date] = None
+
+class StayCalculatorBatchRequest(BaseModel):
+    travellers: List[StayCalculatorRequest]
+
+class IncrementalScoreRequest(BaseModel):
+    state: Optional[str] = None  # token from the previous response; omitted = empty form
+    answers: Dict[str, Optional[str]] = {}  # changed answers only, null clears one
+
+@app.get("/")
+async def root():
+    return {"status": "ok", "message": "Simplify Slovakia API"}
+
+@app.get("/metrics")
+async def get_metrics():
+    """Request latency histograms, status counts, catalog loads and cache hit ratios (Prometheus text format)"""
+    return Response(metrics.prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+FIELDS_DESCRIPTION = "Preset (full, summary) or comma-separated field names"
+
+@app.get("/flows", response_class=PrebuiltJSONResponse)
+async def get_flows(
+    request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    category: Optional[List[str]] = Query(None),
+    tag: Optional[List[str]] = Query(None),
+    difficulty: Optional[List[str]] = Query(None),
+    priority: Optional[List[str]] = Query(None),
+    lifecycle_phase: Optional[List[str]] = Query(None),
+):
+    """
+    Get all available flows with metadata.
+    Facet filters (case-insensitive) are ANDed across facets and ORed when
+    repeated; filtered responses add "total" and per-value "facets" counts.
+    """
+    try:
+        key, selected = parse_fields(fields, FLOWS_PRESETS, FLOW_SUMMARY_FIELDS)
+    except ProjectionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return flows
+    with span("catalog"):
+        catalog = await get_catalog()
+    facets = selected_facets(
+        category=category, tag=tag, difficulty=difficulty,
+        priority=priority, lifecycle_phase=lifecycle_phase,
+    )
+    if facets:
+        with span("assembly"):
+            return PrebuiltJSONResponse(catalog.filtered_flows_body(facets, selected))
+    with span("assembly"):
+        payload = catalog.flows_projection(key, selected)
+    with span("serialize"):
+        return payload.response(request)
 
-# Calculate match score
-def calculate_flow_match_score(flow: dict, answers: dict) -> tuple[float, list[str]]:
+@app.get("/flows/facets", response_class=PrebuiltJSONResponse)
+async def get_flow_facets(request: Request):
+    """Facet values with flow counts over the whole catalog"""
+    catalog = await get_catalog()
+    return catalog.facets_payload.response(request)
+
+MAX_MERGE_FLOWS = 10
+
+@app.get("/flows/merge", response_class=PrebuiltJSONResponse)
+async def get_merged_flows(request: Request, ids: str = Query(..., description="Comma-separated flow IDs")):
     """
-    Calculate match score based on intake_matches rules.
-    Returns (score, reasons) where score is 0-100
+    Several flows as one plan, for users in more than one situation.
+    Shared steps appear once; steps are ordered by dependency waves
+    (every step only needs flags from earlier waves or external_flags).
     """
-    intake_matches = flow.get('intake_matches', [])
+    flow_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not flow_ids:
+        raise HTTPException(status_code=400, detail="ids must list at least one flow ID")
+    if len(flow_ids) > MAX_MERGE_FLOWS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_MERGE_FLOWS} flow IDs per request")
     
-    if not intake_matches:
-        # No matching rules - return low score
-        return 0.0, ["Flow has no intake_matches rules"]
+    catalog = await get_catalog()
+    for flow_id in flow_ids:
+        if flow_id not in catalog.flows_by_id:
+            raise HTTPException(status_code=404, detail=f"Flow {flow_id} not found")
     
-    total_possible_weight = sum(match.get('weight', 0) for match in intake_matches)
-    if total_possible_weight == 0:
-        return 0.0, ["Total weight is zero"]
+    return catalog.merged_plan(flow_ids).response(request)
+
+@app.get("/flow/{flow_id}", response_class=PrebuiltJSONResponse)
+async def get_flow(
+    flow_id: str,
+    request: Request,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    format: Optional[str] = Query(None, description="'normalized' for step refs plus a steps map keyed by content hash"),
+):
+    """
+    Get specific flow with all steps.
+    With ?fields= the flow is reduced to its /flows summary and each step
+    to step_id plus the requested step fields (summary = title, order).
+    With ?format=normalized steps come once each in a hash-keyed map.
+    """
+    try:
+        key, selected = parse_fields(fields, FLOW_PRESETS, STEP_FIELDS)
+    except ProjectionError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format not in (None, "normalized"):
+        raise HTTPException(status_code=400, detail="format must be 'normalized' or omitted")
+    if format == "normalized" and selected is not None:
+        raise HTTPException(status_code=400, detail="format=normalized cannot be combined with fields")
     
-    matched_weight = 0
-    reasons = []
+    with span("catalog"):
+        catalog = await get_catalog()
+    with span("assembly"):
+        if format == "normalized":
+            payload = catalog.normalized_flow_payloads.get(flow_id)
+        else:
+            payload = catalog.flow_projection(flow_id, key, selected)
     
-    for match in intake_matches:
-        question_id = match.get('question')
-        required_answer = match.get('required_answer')
-        weight = match.get('weight', 0)
-        reason = match.get('reason', '')
-        
-        # Skip if no question or weight
-        if not question_id or weight == 0:
-            continue
-        
-        # Get user's answer
-        user_answer = answers.get(question_id)
-        
-        # Handle special cases
-        if required_answer is None or required_answer == 'ANY':
-            # Match any answer
-            matched_weight += weight
-            if reason:
-                reasons.append(f"✓ {reason}")
-            continue
-        
-        if required_answer == 'null':
-            # Treat 'null' string as any match
-            matched_weight += weight
-            if reason:
-                reasons.append(f"✓ {reason}")
-            continue
-        
-        # Check if user answered this question
-        if user_answer is None:
-            # User hasn't answered - skip this rule
-            continue
-        
-        # Handle array of acceptable answers
-        if isinstance(required_answer, list):
-            if user_answer in required_answer:
-                matched_weight += weight
-                if reason:
-                    reasons.append(f"✓ {reason}")
-        # Handle single answer
-        elif str(user_answer) == str(required_answer):
-            matched_weight += weight
-            if reason:
-                reasons.append(f"✓ {reason}")
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Flow {flow_id} not found")
     
-    # Calculate percentage score
-    score = (matched_weight / total_possible_weight) * 100
+    with span("serialize"):
+        return payload.response(request)
+
+@app.post("/flow/{flow_id}/progress", response_class=PrebuiltJSONResponse)
+async def get_flow_progress(flow_id: str, progress: FlowProgressRequest):
+    """
+    Next actionable steps from what the user has done: completed step IDs
+    and/or state flags (e.g. legal_entry_completed) satisfied elsewhere.
+    Returns completed, unlocked and blocked steps (with missing flags).
+    """
+    catalog = await get_catalog()
+    result = catalog.flow_progress(flow_id, progress.completed_steps, progress.state_flags)
     
-    return score, reasons
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Flow {flow_id} not found")
+    
+    return PrebuiltJSONResponse(dump_json(result))
 
-@app.get("/")
-def root():
-    return {"status": "ok", "message": "Simplify Slovakia API"}
+# Schedules are for plans, not history or the far future - this also keeps
+# every date the scheduler derives from the anchor well inside date's range
+MAX_ANCHOR_DAYS = 3660
 
-@app.get("/flows")
-def get_flows():
-    """Get all available flows with metadata"""
-    flows = load_all_flows()
+@app.get("/flow/{flow_id}/schedule", response_class=PrebuiltJSONResponse)
+async def get_flow_schedule(
+    flow_id: str,
+    request: Request,
+    anchor: Optional[date] = Query(None, description="Start date, e.g. entry into Slovakia (default today)"),
+):
+    """
+    Timeline of a flow from an anchor date: earliest start, latest finish
+    and slack per step, with deadlines counted in Slovak working days
+    where they say so. Steps with no slack are on the critical path.
+    """
+    today = date.today()
+    anchor = anchor or today
+    if abs((anchor - today).days) > MAX_ANCHOR_DAYS:
+        raise HTTPException(status_code=400, detail=f"anchor must be within {MAX_ANCHOR_DAYS} days of today")
     
-    flow_list = []
-    for flow in flows:
-        display_info = flow.get('display_info', {})
-        flow_list.append({
-            "flow_id": flow.get('flow_id'),
-            "title": display_info.get('title', flow.get('flow_id')),
-            "category": display_info.get('category', 'General'),
-            "description": display_info.get('description', ''),
-            "difficulty": display_info.get('difficulty_level', 'MEDIUM'),
-            "estimated_timeline": display_info.get('estimated_timeline', 'Unknown'),
-            "estimated_cost": display_info.get('estimated_cost', 'Unknown'),
-            "priority": display_info.get('priority', 'MEDIUM'),
-            "tags": display_info.get('tags', []),
-            "step_count": len(flow.get('steps', [])),
-            "recommended_for": display_info.get('recommended_for', ''),
-            "not_for": display_info.get('not_for', ''),
-        })
+    catalog = await get_catalog()
+    payload = catalog.flow_schedule(flow_id, anchor)
     
-    return {"flows": flow_list}
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Flow {flow_id} not found")
+    
+    return payload.response(request)
 
-@app.get("/flow/{flow_id}")
-def get_flow(flow_id: str):
-    """Get specific flow with all steps"""
-    flows = load_all_flows()
-    flow = next((f for f in flows if f.get('flow_id') == flow_id), None)
+@app.get("/flow/{flow_id}/documents", response_class=PrebuiltJSONResponse)
+async def get_flow_documents(flow_id: str, request: Request):
+    """
+    Document checklist of a flow: each required document once (by
+    canonical id), with the first step that needs it and every step that does
+    """
+    catalog = await get_catalog()
+    payload = catalog.document_payloads.get(flow_id)
     
-    if not flow:
+    if payload is None:
         raise HTTPException(status_code=404, detail=f"Flow {flow_id} not found")
     
-    # Load step details
-    steps = []
-    for step_ref in flow.get('steps', []):
-        step_id = step_ref.get('step_id')
-        order = step_ref.get('order')
-        
-        step_file = STEPS_DIR / f"{step_id}.yaml"
-        if step_file.exists():
-            try:
-                with open(step_file, 'r', encoding='utf-8') as f:
-                    step_data = yaml.safe_load(f)
-                    if step_data:
-                        step_data['order'] = order
-                        steps.append(step_data)
-            except Exception as e:
-                print(f"Error loading step {step_id}: {e}")
+    return payload.response(request)
+
+@app.get("/step/{step_id}", response_class=PrebuiltJSONResponse)
+async def get_step(step_id: str, request: Request):
+    """Get a single step by ID"""
+    catalog = await get_catalog()
+    payload = catalog.step_payloads.get(step_id)
+    
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"Step {step_id} not found")
+    
+    return payload.response(request)
+
+@app.get("/catalog/manifest", response_class=PrebuiltJSONResponse)
+async def get_catalog_manifest(request: Request):
+    """Catalog version, overall hash and the content hash of every flow and step"""
+    catalog = await get_catalog()
+    return catalog.manifest_payload.response(request)
+
+@app.get("/catalog/changes", response_class=PrebuiltJSONResponse)
+async def get_catalog_changes(request: Request, since: Optional[int] = None, since_hash: Optional[str] = None):
+    """
+    Flows and steps added, changed or removed since catalog version `since`
+    (with `since_hash`, the catalog hash the client has at that version).
+    An unknown version (or none) gets a reset patch with everything.
+    """
+    catalog = await get_catalog()
+    return catalog.change_payload(since, since_hash).response(request)
+
+@app.get("/bundle", response_class=PrebuiltJSONResponse)
+async def get_bundle(request: Request):
+    """
+    Whole catalog in one response for offline use: flow summaries, flows,
+    each distinct step once in "steps" (keyed by content hash), a
+    "step_hashes" index from step_id to that hash, and the recommendation table.
+    X-Bundle-Hash names the immutable copy at /bundle/{bundle_hash}.
+    """
+    catalog = await get_catalog()
+    return catalog.bundle_payload.response(request, headers={"X-Bundle-Hash": catalog.bundle_hash})
+
+@app.get("/bundle/{bundle_hash}", response_class=PrebuiltJSONResponse)
+async def get_bundle_by_hash(bundle_hash: str, request: Request):
+    """Content-addressed bundle; 404 once the catalog has moved on"""
+    catalog = await get_catalog()
+    if bundle_hash != catalog.bundle_hash:
+        raise HTTPException(status_code=404, detail=f"Bundle {bundle_hash} not found")
+    return catalog.bundle_payload.response(
+        request, headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
+MAX_SEARCH_RESULTS = 50
+
+@app.get("/search", response_class=PrebuiltJSONResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_RESULTS),
+):
+    """
+    Full-text search over flows and steps (titles, descriptions,
+    why_it_matters, failure_modes, tags). Accent-insensitive, BM25-ranked,
+    and the last word matches as a prefix.
+    """
+    catalog = await get_catalog()
+    results = catalog.search_index.search(q, limit)
+    return PrebuiltJSONResponse(dump_json({"query": q, "results": results}))
+
+MAX_BULK_STEPS = 200
+
+@app.get("/steps", response_class=PrebuiltJSONResponse)
+async def get_steps(request: Request, ids: str = Query(..., description="Comma-separated step IDs")):
+    """
+    Get several steps in one request, e.g. the few a client is missing.
+    Unknown IDs are listed under "missing" instead of failing the request.
+    """
+    step_ids = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if not step_ids:
+        raise HTTPException(status_code=400, detail="ids must list at least one step ID")
+    if len(step_ids) > MAX_BULK_STEPS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_STEPS} step IDs per request")
+    
+    catalog = await get_catalog()
+    found = []
+    missing = []
+    for step_id in step_ids:
+        payload = catalog.step_payloads.get(step_id)
+        if payload is None:
+            missing.append(step_id)
         else:
-            # Step file doesn't exist - create placeholder
-            steps.append({
-                "step_id": step_id,
-                "order": order,
-                "title": f"Step {order}: {step_id}",
-                "description": f"Step file {step_id}.yaml not found",
-                "error": "Step file missing"
-            })
+            found.append(payload)
     
-    # Sort by order
-    steps.sort(key=lambda x: x.get('order', 999))
+    # Stitch the per-step bytes together - no step is re-serialized
+    missing_json = dump_json(missing)
+    etag = make_etag(*(p.etag.encode() for p in found), missing_json)
+    if etag_matches(request.headers.get("if-none-match", ""), etag):
+        return not_modified(etag)
     
-    return {
-        "flow": flow,
-        "steps": steps
-    }
+    body = b'{"steps":[' + b",".join(p.body for p in found) + b'],"missing":' + missing_json + b'}'
+    return PrebuiltJSONResponse(body, headers={"ETag": etag})
 
 @app.post("/recommend-flow-v2", response_model=FlowRecommendation)
-def recommend_flow_v2(answers: IntakeAnswersV2):
+async def recommend_flow_v2(answers: IntakeAnswersV2):
     """
     Recommend best flow based on intake answers using metadata scoring.
     This is the new intelligent recommendation engine.
@@ -209,70 +361,90 @@ def recommend_flow_v2(answers: IntakeAnswersV2):
     # Convert to dict and remove None values
     answers_dict = {k: v for k, v in answers.dict().items() if v is not None}
     
-    print(f"📥 Received answers: {answers_dict}")
-    
-    flows = load_all_flows()
-    
-    if not flows:
+    with span("catalog"):
+        catalog = await get_catalog()
+    if not catalog.flows:
         raise HTTPException(status_code=500, detail="No flows available")
     
-    # Score each flow
-    scored_flows = []
-    for flow in flows:
-        try:
-            score, reasons = calculate_flow_match_score(flow, answers_dict)
-            
-            display_info = flow.get('display_info', {})
-            confidence_threshold = flow.get('confidence_threshold', 70)
-            
-            # Determine confidence level
-            if score >= 85:
-                confidence = "HIGH"
-            elif score >= confidence_threshold:
-                confidence = "MEDIUM"
-            elif score >= 30:
-                confidence = "LOW"
-            else:
-                confidence = "NONE"
-            
-            scored_flows.append({
-                "flow_id": flow.get('flow_id'),
-                "title": display_info.get('title', flow.get('flow_id')),
-                "score": score,
-                "confidence": confidence,
-                "reasons": reasons,
-                "description": display_info.get('description', ''),
-            })
-            
-            print(f"   {flow.get('flow_id')}: {score:.1f}% ({confidence})")
-            
-        except Exception as e:
-            print(f"❌ Error scoring flow {flow.get('flow_id')}: {e}")
-            # Don't let one bad flow crash the whole recommendation
-            continue
-    
-    # Sort by score
-    scored_flows.sort(key=lambda x: x['score'], reverse=True)
+    with span("scoring"):
+        best_match = recommend(catalog.eligibility, answers_dict)
     
-    if not scored_flows:
+    if best_match is None:
         raise HTTPException(status_code=500, detail="Could not score any flows")
     
-    # Get best match
-    best_match = scored_flows[0]
-    
-    print(f"🎯 Best match: {best_match['flow_id']} ({best_match['score']:.1f}%)")
-    
-    return FlowRecommendation(
-        flow_id=best_match['flow_id'],
-        title=best_match['title'],
-        confidence=best_match['confidence'],
-        score=best_match['score'],
-        reason="; ".join(best_match['reasons'][:3]) if best_match['reasons'] else None
-    )
+    # Encoded here rather than by FastAPI, so the span covers the JSON encoding
+    with span("serialize"):
+        return PrebuiltJSONResponse(dump_json(to_recommendation(best_match)))
+
+MAX_STAYS = 1000
+MAX_BATCH_TRAVELLERS = 500
+
+def _stay_result(stay_request: StayCalculatorRequest) -> dict:
+    if len(stay_request.stays) > MAX_STAYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_STAYS} stays per traveller")
+    try:
+        return calculate_stay(
+            [(s.entry, s.exit) for s in stay_request.stays],
+            stay_request.on or date.today(),
+            stay_request.planned_entry,
+        )
+    except StayError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/schengen/stay-calculator", response_class=PrebuiltJSONResponse)
+async def schengen_stay_calculator(stay_request: StayCalculatorRequest):
+    """
+    Schengen 90/180-day rule: days used and remaining in the 180-day window
+    ending `on`, whether any past window went over 90 days, and for a
+    planned entry the latest exit date of a continuous stay.
+    """
+    return PrebuiltJSONResponse(dump_json(_stay_result(stay_request)))
+
+@app.post("/schengen/stay-calculator/batch", response_class=PrebuiltJSONResponse)
+async def schengen_stay_calculator_batch(batch: StayCalculatorBatchRequest):
+    """Same as /schengen/stay-calculator for many travellers, results in request order"""
+    if len(batch.travellers) > MAX_BATCH_TRAVELLERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_TRAVELLERS} travellers per request")
+    return PrebuiltJSONResponse(dump_json({"results": [_stay_result(t) for t in batch.travellers]}))
+
+@app.post("/intake/next-question", response_class=PrebuiltJSONResponse)
+async def intake_next_question(answers: IntakeAnswersV2):
+    """
+    Adaptive intake: with the answers so far, either the recommendation
+    (when no remaining answer could change the top flow) or the single
+    question that best separates the flows still in contention.
+    """
+    catalog = await get_catalog()
+    return PrebuiltJSONResponse(dump_json(catalog.intake.next_step(answers.dict())))
+
+@app.post("/intake/score", response_class=PrebuiltJSONResponse)
+async def intake_score(score_request: IncrementalScoreRequest):
+    """
+    Live scoring while the intake form is filled in: send the changed
+    answers with the previous state token, get back the same recommendation
+    /recommend-flow-v2 would give, every flow's score and a new token.
+    """
+    unknown = [q for q in score_request.answers if q not in INTAKE_QUESTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown intake questions: {', '.join(unknown)}")
+
+    with span("catalog"):
+        scorer = (await get_catalog()).scorer
+    with span("scoring"):
+        try:
+            state = scorer.decode(score_request.state) if score_request.state else scorer.initial
+        except StateTokenError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        for question, answer in score_request.answers.items():
+            state = scorer.apply(state, question, answer)
+        result = scorer.result(state)
+
+    with span("serialize"):
+        return PrebuiltJSONResponse(dump_json({"state": scorer.encode(state), **result}))
 
 # Backward compatibility endpoint
 @app.post("/recommend-flow")
-def recommend_flow_v1_compat(answers: dict):
+async def recommend_flow_v1_compat(answers: dict):
     """
     Old recommendation endpoint - converts to v2 format
     """
@@ -287,7 +459,7 @@ def recommend_flow_v1_compat(answers: dict):
         city=answers.get('city'),
     )
     
-    return recommend_flow_v2(v2_answers)
+    return await recommend_flow_v2(v2_answers)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,257 @@
+# backend/app/metrics.py
+# Request metrics - latency histograms, status counts, catalog loads, cache hit ratios
+
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+
+# Latency histogram upper bounds, seconds (Prometheus default buckets, finer below 5ms)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Label for requests no route matched (404s) - raw paths would be unbounded
+UNMATCHED_ROUTE = "unmatched"
+
+# CloudWatch Embedded Metric Format
+EMF_NAMESPACE = os.environ.get("EMF_NAMESPACE", "SimplifySlovakia")
+# CloudWatch takes at most 100 values per metric in one EMF document
+EMF_MAX_VALUES = 100
+
+
+class _Shard:
+    """One thread's counters. Only its own thread writes to it, so no locks."""
+
+    __slots__ = ("requests", "latency", "cache", "catalog_loads")
+
+    def __init__(self):
+        # (route, method, status) -> count
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        # (route, method) -> per-bucket counts (last = +Inf), then the sum
+        self.latency: Dict[Tuple[str, str], List[float]] = {}
+        # cache -> [hits, misses]
+        self.cache: Dict[str, List[int]] = {}
+        # reason ("cold", "reload") -> [count, total seconds]
+        self.catalog_loads: Dict[str, List[float]] = {}
+
+
+class Metrics:
+    """
+    Process-wide metrics. Each thread counts into its own shard (the event
+    loop thread gets nearly everything; catalog loads run in the thread
+    pool), and readers sum the shards - recording never takes a lock.
+
+    With `emf` on (Lambda), each request is also queued for the next
+    flush_emf(), which writes everything from one invocation at once.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()  # only taken when a thread first records
+        self.last_catalog_load = 0.0
+        self.emf = False
+        self._pending: List[Tuple[str, str, int, float]] = []
+        self._pending_loads: List[Tuple[str, float]] = []
+        self._flushed_cache: Dict[str, Tuple[int, int]] = {}
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float):
+        shard = self._shard()
+        key = (route, method, status)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+        counts = shard.latency.get((route, method))
+        if counts is None:
+            counts = shard.latency[(route, method)] = [0] * (len(LATENCY_BUCKETS) + 2)
+        counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        counts[-1] += seconds
+        if self.emf:
+            self._pending.append((route, method, status, seconds))
+
+    def cache_lookup(self, cache: str, hit: bool):
+        shard = self._shard()
+        counts = shard.cache.get(cache)
+        if counts is None:
+            counts = shard.cache[cache] = [0, 0]
+        counts[0 if hit else 1] += 1
+
+    def catalog_loaded(self, reason: str, seconds: float):
+        loads = self._shard().catalog_loads.setdefault(reason, [0, 0.0])
+        loads[0] += 1
+        loads[1] += seconds
+        self.last_catalog_load = seconds
+        if self.emf:
+            self._pending_loads.append((reason, seconds))
+
+    # Readers - sum every shard
+
+    def _merged(self, attr: str) -> dict:
+        merged: dict = {}
+        for shard in list(self._shards):
+            for key, value in list(getattr(shard, attr).items()):
+                if isinstance(value, list):
+                    total = merged.setdefault(key, [0] * len(value))
+                    for i, v in enumerate(value):
+                        total[i] += v
+                else:
+                    merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def cache_totals(self) -> Dict[str, Tuple[int, int]]:
+        return {cache: (hits, misses) for cache, (hits, misses) in self._merged("cache").items()}
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        lines = [
+            "# HELP http_requests_total Requests by route, method and status",
+            "# TYPE http_requests_total counter",
+        ]
+        for (route, method, status), count in sorted(self._merged("requests").items()):
+            lines.append(f'http_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency by route and method",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (route, method), counts in sorted(self._merged("latency").items()):
+            labels = f'route="{route}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {counts[-1]}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+
+        lines += [
+            "# HELP catalog_loads_total Catalog builds from YAML, by reason",
+            "# TYPE catalog_loads_total counter",
+        ]
+        loads = self._merged("catalog_loads")
+        for reason, (count, _) in sorted(loads.items()):
+            lines.append(f'catalog_loads_total{{reason="{reason}"}} {count}')
+        lines += [
+            "# HELP catalog_load_seconds_total Time spent building the catalog, by reason",
+            "# TYPE catalog_load_seconds_total counter",
+        ]
+        for reason, (_, seconds) in sorted(loads.items()):
+            lines.append(f'catalog_load_seconds_total{{reason="{reason}"}} {seconds}')
+        lines += [
+            "# HELP catalog_last_load_seconds Duration of the most recent catalog build",
+            "# TYPE catalog_last_load_seconds gauge",
+            f"catalog_last_load_seconds {self.last_catalog_load}",
+        ]
+
+        caches = self.cache_totals()
+        lines += [
+            "# HELP cache_lookups_total In-memory cache lookups, by cache and result",
+            "# TYPE cache_lookups_total counter",
+        ]
+        for cache, (hits, misses) in sorted(caches.items()):
+            lines.append(f'cache_lookups_total{{cache="{cache}",result="hit"}} {hits}')
+            lines.append(f'cache_lookups_total{{cache="{cache}",result="miss"}} {misses}')
+        lines += [
+            "# HELP cache_hit_ratio Hits / lookups since the process started",
+            "# TYPE cache_hit_ratio gauge",
+        ]
+        for cache, (hits, misses) in sorted(caches.items()):
+            lines.append(f'cache_hit_ratio{{cache="{cache}"}} {hits / (hits + misses) if hits + misses else 0.0}')
+        return "\n".join(lines) + "\n"
+
+    def emf_documents(self) -> List[dict]:
+        """Everything recorded since the last call, as EMF documents"""
+        pending, self._pending = self._pending, []
+        pending_loads, self._pending_loads = self._pending_loads, []
+        timestamp = int(time.time() * 1000)
+
+        def document(dimension: str, value: str, metrics: Dict[str, Tuple[str, object]]) -> dict:
+            return {
+                "_aws": {
+                    "Timestamp": timestamp,
+                    "CloudWatchMetrics": [{
+                        "Namespace": EMF_NAMESPACE,
+                        "Dimensions": [[dimension]],
+                        "Metrics": [{"Name": name, "Unit": unit} for name, (unit, _) in metrics.items()],
+                    }],
+                },
+                dimension: value,
+                **{name: v for name, (_, v) in metrics.items()},
+            }
+
+        by_route: Dict[str, List[Tuple[int, float]]] = {}
+        for route, method, status, seconds in pending:
+            by_route.setdefault(f"{method} {route}", []).append((status, seconds))
+        documents = []
+        for route, requests in by_route.items():
+            for i in range(0, len(requests), EMF_MAX_VALUES):
+                chunk = requests[i:i + EMF_MAX_VALUES]
+                documents.append(document("Route", route, {
+                    "Latency": ("Milliseconds", [seconds * 1000 for _, seconds in chunk]),
+                    "Requests": ("Count", len(chunk)),
+                    "ServerErrors": ("Count", sum(1 for status, _ in chunk if status >= 500)),
+                }))
+
+        for reason, seconds in pending_loads:
+            documents.append(document("Reason", reason, {"CatalogLoad": ("Milliseconds", seconds * 1000)}))
+
+        totals = self.cache_totals()
+        for cache, (hits, misses) in totals.items():
+            last_hits, last_misses = self._flushed_cache.get(cache, (0, 0))
+            if (hits, misses) != (last_hits, last_misses):
+                documents.append(document("Cache", cache, {
+                    "CacheHits": ("Count", hits - last_hits),
+                    "CacheMisses": ("Count", misses - last_misses),
+                }))
+        self._flushed_cache = totals
+        return documents
+
+    def flush_emf(self):
+        """One stdout write per invocation - CloudWatch Logs turns each line into metrics"""
+        documents = self.emf_documents()
+        if documents:
+            sys.stdout.write("".join(json.dumps(d, separators=(",", ":")) + "\n" for d in documents))
+            sys.stdout.flush()
+
+
+metrics = Metrics()
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware task/stream overhead):
+    times each HTTP request and labels it with the matched route template,
+    e.g. /flow/{flow_id}, which FastAPI leaves in the scope.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # an exception before the response started is a 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            metrics.observe_request(
+                route.path if route is not None else UNMATCHED_ROUTE,
+                scope["method"], status, time.perf_counter() - start,
+            )
@@ -0,0 +1,11 @@
+from app.models.catalog import (
+    CatalogValidationError,
+    Deadline,
+    DisplayInfo,
+    DocumentRequirement,
+    Duration,
+    Flow,
+    IntakeMatch,
+    Step,
+    StepRef,
+)
@@ -0,0 +1,273 @@
+# backend/app/models/catalog.py
+# Typed catalog records - validated once at load, read at request time
+
+import sys
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple, Union, Mapping
+
+# Answers that mean "any answer matches" in intake_matches
+MATCH_ANY = (None, 'ANY', 'null')
+
+
+class CatalogValidationError(ValueError):
+    pass
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings so repeated enum values (NON_EU_VISA_REQUIRED, Slovakia, ...) share one object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _str(data: Mapping, key: str, default: Optional[str] = None, where: str = "") -> Optional[str]:
+    value = data.get(key, default)
+    if value is not None and not isinstance(value, str):
+        raise CatalogValidationError(f"{where}: '{key}' must be a string, got {type(value).__name__}")
+    return value
+
+
+def _str_tuple(data: Mapping, key: str, where: str) -> Tuple[str, ...]:
+    value = data.get(key) or []
+    if not isinstance(value, list):
+        raise CatalogValidationError(f"{where}: '{key}' must be a list")
+    return tuple(sys.intern(str(v)) for v in value)
+
+
+def _number(data: Mapping, key: str, default: float, where: str) -> float:
+    value = data.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise CatalogValidationError(f"{where}: '{key}' must be a number")
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class IntakeMatch:
+    question: Optional[str]
+    # None = matches any answer; tuple = one of; str = exactly (compared as str)
+    required_answer: Union[None, str, Tuple[Any, ...]]
+    weight: float
+    reason: str
+
+    @classmethod
+    def from_dict(cls, data: Mapping, where: str) -> "IntakeMatch":
+        if not isinstance(data, dict):
+            raise CatalogValidationError(f"{where}: intake_matches entries must be mappings")
+        required = data.get('required_answer')
+        if required in MATCH_ANY:
+            required = None
+        elif isinstance(required, list):
+            required = tuple(_intern(v) for v in required)
+        else:
+            required = sys.intern(str(required))
+        question = _str(data, 'question', where=where)
+        return cls(
+            question=sys.intern(question) if question else None,
+            required_answer=required,
+            weight=_number(data, 'weight', 0, where),
+            reason=_str(data, 'reason', '', where) or '',
+        )
+
+    def matches(self, answer: Any) -> bool:
+        """Same rules as the original dict-based scoring"""
+        if self.required_answer is None:
+            return True
+        if answer is None:
+            return False
+        if isinstance(self.required_answer, tuple):
+            return answer in self.required_answer
+        return str(answer) == self.required_answer
+
+
+@dataclass(frozen=True, slots=True)
+class DisplayInfo:
+    title: str
+    category: str
+    description: str
+    difficulty_level: str
+    estimated_timeline: str
+    estimated_cost: str
+    priority: str
+    tags: Tuple[str, ...]
+    recommended_for: Any
+    not_for: Any
+
+    @classmethod
+    def from_dict(cls, data: Mapping, flow_id: str, where: str) -> "DisplayInfo":
+        if not isinstance(data, dict):
+            raise CatalogValidationError(f"{where}: display_info must be a mapping")
+        return cls(
+            title=data.get('title', flow_id),
+            category=_intern(data.get('category', 'General')),
+            description=data.get('description', ''),
+            difficulty_level=_intern(data.get('difficulty_level', 'MEDIUM')),
+            estimated_timeline=data.get('estimated_timeline', 'Unknown'),
+            estimated_cost=data.get('estimated_cost', 'Unknown'),
+            priority=_intern(data.get('priority', 'MEDIUM')),
+            tags=_str_tuple(data, 'tags', where),
+            recommended_for=data.get('recommended_for', ''),
+            not_for=data.get('not_for', ''),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class StepRef:
+    step_id: str
+    order: Optional[int]
+
+
+@dataclass(frozen=True, slots=True)
+class Flow:
+    flow_id: str
+    country: Optional[str]
+    version: Optional[str]
+    display_info: DisplayInfo
+    eligibility: Mapping[str, Any]
+    intake_matches: Tuple[IntakeMatch, ...]
+    # Sum of every intake_matches weight, the denominator of the match score
+    total_weight: float
+    confidence_threshold: float
+    steps: Tuple[StepRef, ...]
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Flow":
+        flow_id = data.get('flow_id')
+        if not isinstance(flow_id, str) or not flow_id:
+            raise CatalogValidationError("flow without a flow_id")
+        where = f"flow {flow_id}"
+
+        eligibility = data.get('eligibility') or {}
+        if not isinstance(eligibility, dict):
+            raise CatalogValidationError(f"{where}: eligibility must be a mapping")
+        matches = data.get('intake_matches') or []
+        if not isinstance(matches, list):
+            raise CatalogValidationError(f"{where}: intake_matches must be a list")
+        steps = data.get('steps') or []
+        if not isinstance(steps, list) or not all(isinstance(s, dict) for s in steps):
+            raise CatalogValidationError(f"{where}: steps must be a list of mappings")
+
+        intake_matches = tuple(IntakeMatch.from_dict(m, where) for m in matches)
+        return cls(
+            flow_id=sys.intern(flow_id),
+            country=_intern(data.get('country')),
+            version=_intern(data.get('version')),
+            display_info=DisplayInfo.from_dict(data.get('display_info', {}), flow_id, where),
+            eligibility={sys.intern(str(k)): _intern(v) for k, v in eligibility.items()},
+            intake_matches=intake_matches,
+            total_weight=sum(m.weight for m in intake_matches),
+            confidence_threshold=_number(data, 'confidence_threshold', 70, where),
+            steps=tuple(StepRef(sys.intern(str(s.get('step_id'))), s.get('order')) for s in steps),
+        )
+
+
+def _days(data: Mapping, key: str, where: str) -> int:
+    value = data.get(key)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise CatalogValidationError(f"{where}: '{key}' must be a whole number of days")
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Duration:
+    """How long a step takes: `duration: {min_days, max_days, working_days}`"""
+    min_days: int
+    max_days: int
+    working_days: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Any, where: str) -> "Duration":
+        if not isinstance(data, dict):
+            raise CatalogValidationError(f"{where}: duration must be a mapping")
+        max_days = _days(data, 'max_days', where)
+        min_days = _days(data, 'min_days', where) if 'min_days' in data else max_days
+        if min_days > max_days:
+            raise CatalogValidationError(f"{where}: duration min_days is above max_days")
+        return cls(min_days, max_days, bool(data.get('working_days', False)))
+
+
+@dataclass(frozen=True, slots=True)
+class Deadline:
+    """
+    `deadline: {days, working_days, after}`: the step must be done (the
+    application filed) within `days` of the `after` flag being set;
+    without `after`, of the flow's anchor date (e.g. entry into Slovakia).
+    """
+    days: int
+    working_days: bool = False
+    after: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Any, where: str) -> "Deadline":
+        if not isinstance(data, dict):
+            raise CatalogValidationError(f"{where}: deadline must be a mapping")
+        after = _str(data, 'after', where=where)
+        return cls(
+            days=_days(data, 'days', where),
+            working_days=bool(data.get('working_days', False)),
+            after=sys.intern(after) if after else None,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DocumentRequirement:
+    """One entry of a step's required_documents: a canonical id, or {id, quantity, notes}"""
+    id: str
+    quantity: Optional[int] = None
+    notes: Optional[str] = None
+
+    @classmethod
+    def from_value(cls, value: Any, where: str) -> "DocumentRequirement":
+        if isinstance(value, str):
+            return cls(sys.intern(value))
+        if not isinstance(value, dict) or not isinstance(value.get('id'), str):
+            raise CatalogValidationError(f"{where}: required_documents entries must be an id or have an 'id'")
+        quantity = value.get('quantity')
+        if quantity is not None and (isinstance(quantity, bool) or not isinstance(quantity, int)):
+            raise CatalogValidationError(f"{where}: document quantity must be a whole number")
+        return cls(sys.intern(value['id']), quantity, _str(value, 'notes', where=where))
+
+
+def _documents(data: Mapping, where: str) -> Optional[Tuple[DocumentRequirement, ...]]:
+    value = data.get('required_documents')
+    if value is None:
+        return None
+    if not isinstance(value, list):
+        raise CatalogValidationError(f"{where}: 'required_documents' must be a list")
+    return tuple(DocumentRequirement.from_value(v, where) for v in value)
+
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    step_id: str
+    title: Optional[str]
+    description: Optional[str]
+    preconditions: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    why_it_matters: Optional[str] = None
+    # Informational only (STEP_CONTRACT.md) - kept as loaded
+    official_links: Any = None
+    failure_modes: Any = None
+    applies_to: Any = None
+    country: Optional[str] = None
+    estimated_duration: Any = None
+    duration: Optional[Duration] = None
+    deadline: Optional[Deadline] = None
+    required_documents: Optional[Tuple[DocumentRequirement, ...]] = None
+
+    @classmethod
+    def from_dict(cls, step_id: str, data: Mapping) -> "Step":
+        where = f"step {step_id}"
+        return cls(
+            step_id=sys.intern(step_id),
+            title=_str(data, 'title', where=where),
+            description=_str(data, 'description', where=where),
+            preconditions=_str_tuple(data, 'preconditions', where),
+            outputs=_str_tuple(data, 'outputs', where),
+            why_it_matters=_str(data, 'why_it_matters', where=where),
+            official_links=data.get('official_links'),
+            failure_modes=data.get('failure_modes'),
+            applies_to=data.get('applies_to'),
+            country=_intern(data.get('country')),
+            estimated_duration=data.get('estimated_duration'),
+            duration=Duration.from_dict(data['duration'], where) if data.get('duration') is not None else None,
+            deadline=Deadline.from_dict(data['deadline'], where) if data.get('deadline') is not None else None,
+            required_documents=_documents(data, where),
+        )
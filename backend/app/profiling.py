@@ -0,0 +1,164 @@
+# backend/app/profiling.py
+# On-demand and sampled request profiling (cProfile) for production diagnosis
+
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+
+# On-demand: a request carrying this token (X-Profile-Token header or
+# ?profile_token=) runs under the profiler. Unset = no on-demand profiling.
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN") or None
+# Sampled: profile every Nth request without a token. 0 = off.
+PROFILE_SAMPLE_RATE = int(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+# Rotating on-disk buffer: the newest PROFILE_KEEP profiles are kept
+# (/tmp is the only writable path on Lambda, and it's per instance)
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", "/tmp/api-profiles"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "50"))
+
+PROFILING_ENABLED = PROFILE_TOKEN is not None or PROFILE_SAMPLE_RATE > 0
+
+# Functions listed in an inline summary
+SUMMARY_LINES = 40
+# Headers of the profiled response that don't describe an inline summary body
+REPLACED_HEADERS = {b"content-type", b"content-length", b"content-encoding", b"etag"}
+
+
+def profile_summary(profile: cProfile.Profile) -> str:
+    """pstats text report, by cumulative time"""
+    out = io.StringIO()
+    pstats.Stats(profile, stream=out).strip_dirs().sort_stats("cumulative").print_stats(SUMMARY_LINES)
+    return out.getvalue()
+
+
+class ProfileBuffer:
+    """Directory of .pstats files, oldest deleted past `keep`"""
+
+    def __init__(self, directory: Path, keep: int):
+        self.directory = directory
+        self.keep = keep
+        self.count = 0
+
+    def save(self, profile: cProfile.Profile, method: str, path: str) -> str:
+        """Blocking disk I/O - run it in the thread pool"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.count += 1
+        slug = path.strip("/").replace("/", "_")[:60] or "root"
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{self.count:06d}-{method}-{slug}.pstats"
+        profile.dump_stats(str(self.directory / name))
+
+        # Names sort by time, then sequence
+        saved = sorted(p for p in self.directory.iterdir() if p.suffix == ".pstats")
+        for old in saved[:-self.keep] if self.keep > 0 else saved:
+            old.unlink(missing_ok=True)
+        return name
+
+
+class ProfilingMiddleware:
+    """
+    Runs a request under cProfile when it carries the profile token, or
+    as every `sample_rate`-th request. The profile goes to the on-disk
+    buffer and its file name to an X-Profile-Id header; with
+    X-Profile-Output: inline (or ?profile_output=inline) the response body
+    is replaced by a pstats summary instead, since on Lambda the next
+    request may not reach the instance holding the file.
+
+    cProfile follows the event loop thread, so a profile also contains
+    whatever other requests ran while this one was awaiting. One request
+    is profiled at a time; others run normally meanwhile.
+    """
+
+    def __init__(
+        self,
+        app,
+        token: Optional[str] = PROFILE_TOKEN,
+        sample_rate: int = PROFILE_SAMPLE_RATE,
+        directory: Path = PROFILE_DIR,
+        keep: int = PROFILE_KEEP,
+    ):
+        self.app = app
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.buffer = ProfileBuffer(directory, keep)
+        self.requests = 0
+        self.active = False
+
+    def _requested(self, scope) -> Optional[dict]:
+        """Profiling options if this request carries a valid token, else None"""
+        if self.token is None:
+            return None
+        headers = dict(scope["headers"])
+        token = headers.get(b"x-profile-token")
+        output = headers.get(b"x-profile-output", b"").decode("latin-1")
+        query = scope.get("query_string", b"")
+        if b"profile_" in query:
+            params = parse_qs(query.decode("latin-1"))
+            token = token or params.get("profile_token", [""])[0].encode()
+            output = output or params.get("profile_output", [""])[0]
+        if token and hmac.compare_digest(token, self.token):
+            return {"inline": output == "inline"}
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        options = self._requested(scope)
+        if options is None and self.sample_rate > 0:
+            self.requests += 1
+            if self.requests % self.sample_rate == 0:
+                options = {"inline": False}
+        if options is None or self.active:
+            await self.app(scope, receive, send)
+            return
+
+        self.active = True
+        profile = cProfile.Profile()
+        start_message = None
+        body = []
+
+        async def capture(message):
+            # Hold the response back until the profile can be attached
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, capture)
+            finally:
+                profile.disable()
+        finally:
+            self.active = False
+
+        name = await run_in_threadpool(self.buffer.save, profile, scope["method"], scope["path"])
+        print(f"🔬 Profiled {scope['method']} {scope['path']} -> {self.buffer.directory / name}")
+
+        if options["inline"]:
+            summary = profile_summary(profile).encode()
+            # Keep the headers set further in (CORS, cache headers, ...)
+            kept = [(k, v) for k, v in start_message.get("headers", []) if k.lower() not in REPLACED_HEADERS]
+            headers = kept + [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(summary)).encode()),
+                (b"x-profile-id", name.encode()),
+                (b"x-profiled-status", str(start_message["status"]).encode()),
+            ]
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": summary})
+            return
+
+        start_message["headers"] = list(start_message.get("headers", [])) + [(b"x-profile-id", name.encode())]
+        await send(start_message)
+        await send({"type": "http.response.body", "body": b"".join(body)})
@@ -0,0 +1,80 @@
+# backend/app/projections.py
+# Sparse fieldsets (?fields=) for /flows and /flow/{flow_id}
+
+from typing import Optional, List, Dict, Tuple
+
+# Step fields a client can ask for; step_id is always included
+STEP_FIELDS = (
+    "title", "order", "description", "why_it_matters", "preconditions", "outputs",
+    "official_links", "failure_modes", "applies_to", "country", "estimated_duration",
+    "duration", "deadline", "required_documents",
+)
+
+# Keys of a /flows entry (see catalog.summarize_flow); flow_id is always included
+FLOW_SUMMARY_FIELDS = (
+    "title", "category", "description", "difficulty", "estimated_timeline",
+    "estimated_cost", "priority", "tags", "step_count", "recommended_for", "not_for",
+)
+
+# Named presets. None means the unprojected ("full") representation.
+FLOW_PRESETS: Dict[str, Optional[Tuple[str, ...]]] = {
+    "full": None,
+    "summary": ("title", "order"),
+}
+FLOWS_PRESETS: Dict[str, Optional[Tuple[str, ...]]] = {
+    "full": None,
+    "summary": ("title", "category", "difficulty", "priority", "step_count"),
+}
+
+# Custom field lists are cached after first use; this bounds that cache
+MAX_CUSTOM_PROJECTIONS = 256
+
+
+class ProjectionError(ValueError):
+    pass
+
+
+def parse_fields(
+    fields: Optional[str],
+    presets: Dict[str, Optional[Tuple[str, ...]]],
+    allowed: Tuple[str, ...],
+) -> Tuple[str, Optional[Tuple[str, ...]]]:
+    """
+    Turn a ?fields= value into (cache key, field tuple).
+    Preset names map to themselves; custom lists are normalized to
+    canonical order so "order,title" and "title,order" share one cache entry.
+    """
+    if not fields or fields == "full":
+        return "full", None
+    if fields in presets:
+        return fields, presets[fields]
+
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise ProjectionError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. "
+            f"Use a preset ({', '.join(presets)}) or any of: {', '.join(allowed)}"
+        )
+    selected = tuple(f for f in allowed if f in requested)
+    return ",".join(selected), selected
+
+
+def project(record: dict, id_key: str, selected: Tuple[str, ...]) -> dict:
+    out = {id_key: record.get(id_key)}
+    for field in selected:
+        if field in record:
+            out[field] = record[field]
+    return out
+
+
+def project_flow(summary: dict, steps: List[dict], selected: Tuple[str, ...]) -> dict:
+    """Projected /flow/{flow_id}: the flow's summary plus trimmed steps"""
+    return {
+        "flow": summary,
+        "steps": [project(step, "step_id", selected) for step in steps],
+    }
+
+
+def project_flows(summaries: List[dict], selected: Tuple[str, ...]) -> dict:
+    return {"flows": [project(s, "flow_id", selected) for s in summaries]}
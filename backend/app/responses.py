@@ -0,0 +1,143 @@
+# backend/app/responses.py
+# Responses for static catalog data - serialized once at catalog build
+
+import gzip
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional - gzip alone still works
+    brotli = None
+
+# Below this size compression costs more than it saves (same default as GZipMiddleware)
+MIN_COMPRESS_SIZE = 500
+# Payloads are compressed when the catalog is built, and on Lambda that is the
+# first request of a cold start (lifespan is off). Quality 5 runs at gzip
+# speed and still beats gzip-9; 11 is ~15% smaller but adds seconds.
+BROTLI_QUALITY = 5
+
+
+def _json_default(value: Any):
+    # YAML can hand us dates (e.g. last_verified: 2025-01-01)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dump_json(content: Any) -> bytes:
+    """Same wire format as starlette's JSONResponse, without jsonable_encoder"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=_json_default,
+    ).encode("utf-8")
+
+
+class PrebuiltJSONResponse(Response):
+    """
+    JSON response whose body is already-serialized bytes.
+    Returning it from a route skips FastAPI's jsonable_encoder walk and
+    the per-request json.dumps of large static structures.
+    """
+    media_type = "application/json"
+
+
+def negotiate_encoding(accept_encoding: str, available) -> Optional[str]:
+    """
+    Pick the best coding from `available` for an Accept-Encoding header.
+    Returns None for identity. Ties go to the earlier entry in `available`.
+    """
+    if not accept_encoding:
+        return None
+
+    prefs = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        prefs[coding.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = prefs.get(coding, prefs.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def make_etag(*parts: bytes) -> str:
+    """
+    Weak ETag over the uncompressed bytes - weak because the gzip and br
+    variants of one body are semantically the same representation.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses weak comparison, so W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == tag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+
+
+class Payload:
+    """
+    One static response body plus its precompressed variants and ETag.
+    Compression happens once, when the catalog is built; serving a
+    request only picks which bytes to send.
+    """
+
+    __slots__ = ("body", "encoded", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = make_etag(body)
+        self.encoded: Dict[str, bytes] = {}
+        if len(body) < MIN_COMPRESS_SIZE:
+            return
+
+        if brotli is not None:
+            self.encoded["br"] = brotli.compress(body, quality=BROTLI_QUALITY, mode=brotli.MODE_TEXT)
+        # mtime=0 keeps the gzip bytes identical across builds
+        self.encoded["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+
+    def response(self, request: Request, headers: Optional[Dict[str, str]] = None) -> Response:
+        if etag_matches(request.headers.get("if-none-match", ""), self.etag):
+            return not_modified(self.etag)
+
+        headers = {**(headers or {}), "ETag": self.etag, "Vary": "Accept-Encoding"}
+        coding = negotiate_encoding(request.headers.get("accept-encoding", ""), self.encoded)
+        if coding is None:
+            return PrebuiltJSONResponse(self.body, headers=headers)
+
+        headers["Content-Encoding"] = coding
+        return PrebuiltJSONResponse(self.encoded[coding], headers=headers)
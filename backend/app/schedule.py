@@ -0,0 +1,128 @@
+# backend/app/schedule.py
+# Critical-path timeline of a flow: earliest/latest dates and slack per step
+
+import re
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from app.holidays import add_working_days
+from app.models import Duration, Step
+from app.states import StateRegistry, bit_positions, merge_flows
+
+# Steps without a structured duration: parsed from estimated_duration
+# ("2-3 hours", "60-90 days", "2-4 weeks"), else one day. Anything
+# shorter than a day still takes one - an office visit is a day's errand.
+DEFAULT_DURATION = Duration(1, 1)
+DURATION_RE = re.compile(r"(\d+)(?:\s*-\s*(\d+))?\s*(working day|minute|hour|day|week|month)")
+UNIT_DAYS = {"minute": 0, "hour": 0, "day": 1, "working day": 1, "week": 7, "month": 30}
+
+
+def step_duration(step: Optional[Step]) -> Duration:
+    if step is None:
+        return DEFAULT_DURATION
+    if step.duration is not None:
+        return step.duration
+    if isinstance(step.estimated_duration, str):
+        match = DURATION_RE.search(step.estimated_duration.lower())
+        if match:
+            low, high, unit = match.groups()
+            days = UNIT_DAYS[unit]
+            return Duration(
+                max(1, int(low) * days),
+                max(1, int(high or low) * days),
+                working_days=unit == "working day",
+            )
+    return DEFAULT_DURATION
+
+
+def shift(day: date, days: int, working_days: bool) -> date:
+    return add_working_days(day, days) if working_days else day + timedelta(days=days)
+
+
+def schedule_flow(
+    steps: List[Tuple[str, int, int]],
+    records: Dict[str, Step],
+    states: StateRegistry,
+    anchor: date,
+) -> dict:
+    """
+    Critical-path pass over a flow's state-flag graph, from `anchor` (e.g.
+    the entry date). Durations are planned at their maximum. A step starts
+    once every flag it needs is produced by an earlier step; flags nothing
+    in the flow produces count as set on the anchor date. A deadline caps
+    a step's latest start, and through it its predecessors' latest finish.
+    """
+    waves, _, unresolved = merge_flows([steps])
+    masks = {step_id: (pre, out) for step_id, pre, out in steps}
+    durations = {step_id: step_duration(records.get(step_id)) for step_id, _, _ in steps}
+
+    # Forward pass, wave by wave: earliest start/finish, and when each flag is
+    # first set. A wave only sees flags from earlier waves.
+    producers: Dict[int, List[str]] = {}
+    flag_ready: Dict[int, date] = {}
+    successors: Dict[str, List[str]] = {}
+    earliest: Dict[str, Tuple[date, date]] = {}
+    for wave in waves:
+        for step_id in wave:
+            start = anchor
+            for bit in bit_positions(masks[step_id][0]):
+                if bit in flag_ready:
+                    start = max(start, flag_ready[bit])
+                    for producer in producers[bit]:
+                        successors.setdefault(producer, []).append(step_id)
+            duration = durations[step_id]
+            earliest[step_id] = (start, shift(start, duration.max_days, duration.working_days))
+        for step_id in wave:
+            finish = earliest[step_id][1]
+            for bit in bit_positions(masks[step_id][1]):
+                producers.setdefault(bit, []).append(step_id)
+                flag_ready[bit] = min(flag_ready.get(bit, finish), finish)
+    end = max((finish for _, finish in earliest.values()), default=anchor)
+
+    deadlines: Dict[str, date] = {}
+    for step_id in earliest:
+        record = records.get(step_id)
+        if record is not None and record.deadline is not None:
+            deadline = record.deadline
+            bit = states.bits.get(deadline.after) if deadline.after else None
+            deadlines[step_id] = shift(flag_ready.get(bit, anchor), deadline.days, deadline.working_days)
+
+    # Backward pass: finish before any successor's latest start, and start
+    # (file the application) by the deadline
+    latest: Dict[str, Tuple[date, date]] = {}
+    for wave in reversed(waves):
+        for step_id in wave:
+            finish = end
+            for successor in successors.get(step_id, []):
+                finish = min(finish, latest[successor][0])
+            duration = durations[step_id]
+            start = shift(finish, -duration.max_days, duration.working_days)
+            latest[step_id] = (min(start, deadlines.get(step_id, start)), finish)
+
+    scheduled = []
+    for step_id, _, _ in steps:
+        if step_id not in earliest:
+            continue
+        duration = durations[step_id]
+        slack = (latest[step_id][0] - earliest[step_id][0]).days
+        scheduled.append({
+            "step_id": step_id,
+            "duration_days": [duration.min_days, duration.max_days],
+            "working_days": duration.working_days,
+            "earliest_start": earliest[step_id][0],
+            "earliest_finish": earliest[step_id][1],
+            "latest_start": latest[step_id][0],
+            "latest_finish": latest[step_id][1],
+            "slack_days": slack,
+            "deadline": deadlines.get(step_id),
+            "critical": slack <= 0,
+        })
+    return {
+        "anchor": anchor,
+        "earliest_completion": end,
+        # Negative slack: some deadline can't be met even if everything starts on time
+        "on_schedule": all(s["slack_days"] >= 0 for s in scheduled),
+        "critical_path": [s["step_id"] for s in scheduled if s["critical"]],
+        "steps": scheduled,
+        "unresolved": unresolved,
+    }
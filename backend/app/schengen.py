@@ -0,0 +1,133 @@
+# backend/app/schengen.py
+# Schengen 90/180-day rule - merged intervals + prefix sums, no per-day scans
+
+import bisect
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+# Any 180-day window may hold at most 90 days of stay.
+# Entry and exit days both count as days in the area.
+WINDOW_DAYS = 180
+MAX_STAY_DAYS = 90
+# Dates the results can still be expressed in: the window ending `on` and
+# the longest stay from a planned entry must both fit in date's range
+EARLIEST_ON = date.fromordinal(WINDOW_DAYS)
+LATEST_PLANNED_ENTRY = date.fromordinal(date.max.toordinal() - MAX_STAY_DAYS + 1)
+
+
+class StayError(ValueError):
+    pass
+
+
+class StayHistory:
+    """
+    Stays merged into sorted, disjoint [start, end] day intervals (date
+    ordinals) with a prefix sum of their lengths, so the number of days
+    spent in any range is two binary searches.
+    """
+
+    def __init__(self, stays: Iterable[Tuple[date, date]]):
+        intervals = []
+        for entry, exit in stays:
+            if exit < entry:
+                raise StayError(f"exit {exit} is before entry {entry}")
+            intervals.append((entry.toordinal(), exit.toordinal()))
+        intervals.sort()
+
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        for start, end in intervals:
+            # Overlapping or back-to-back stays are one stay
+            if self.ends and start <= self.ends[-1] + 1:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+        # prefix[i] = days in intervals[:i]
+        self.prefix = [0]
+        for start, end in zip(self.starts, self.ends):
+            self.prefix.append(self.prefix[-1] + end - start + 1)
+
+    def days_before(self, day: int) -> int:
+        """Days of stay strictly before `day`"""
+        i = bisect.bisect_left(self.ends, day)
+        days = self.prefix[i]
+        if i < len(self.starts) and self.starts[i] < day:
+            days += day - self.starts[i]
+        return days
+
+    def days_between(self, first: int, last: int) -> int:
+        """Days of stay in [first, last]"""
+        if last < first:
+            return 0
+        return self.days_before(last + 1) - self.days_before(first)
+
+    def days_in_window(self, day: int) -> int:
+        """Days in the 180-day window ending on `day`"""
+        return self.days_between(day - WINDOW_DAYS + 1, day)
+
+    def max_window(self) -> int:
+        """
+        Most days in any 180-day window. The count only peaks on the last
+        day of a stay or the day before a stay's first day drops out of the
+        window, so only those 2n days are checked.
+        """
+        best = 0
+        for start, end in zip(self.starts, self.ends):
+            best = max(best, self.days_in_window(end), self.days_in_window(start + WINDOW_DAYS - 1))
+        return best
+
+    def latest_exit(self, entry: int) -> Optional[int]:
+        """
+        Last day one can stay when entering on `entry` and staying without a
+        break, counting only earlier stays. None if entering that day is
+        already over the limit.
+        """
+        def days(day: int) -> int:
+            # Earlier stays in the window plus every day since entry
+            return self.days_between(day - WINDOW_DAYS + 1, min(day, entry - 1)) + day - entry + 1
+
+        # days() never decreases while staying, and a stay can't exceed 90
+        # days, so the answer is the last day in [entry, entry + 89] under the limit
+        lo, hi = entry, entry + MAX_STAY_DAYS - 1
+        if days(lo) > MAX_STAY_DAYS:
+            return None
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if days(mid) <= MAX_STAY_DAYS:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+
+def calculate_stay(
+    stays: Iterable[Tuple[date, date]],
+    on: date,
+    planned_entry: Optional[date] = None,
+) -> dict:
+    """Days used and left on `on`, any past overstay, and the latest exit for a planned entry"""
+    if on < EARLIEST_ON:
+        raise StayError(f"on must be {EARLIEST_ON} or later")
+    if planned_entry is not None and planned_entry > LATEST_PLANNED_ENTRY:
+        raise StayError(f"planned_entry must be {LATEST_PLANNED_ENTRY} or earlier")
+    history = StayHistory(stays)
+    day = on.toordinal()
+    used = history.days_in_window(day)
+    max_window = history.max_window()
+    result = {
+        "on": on,
+        "window_start": date.fromordinal(day - WINDOW_DAYS + 1),
+        "days_used": used,
+        "days_remaining": max(0, MAX_STAY_DAYS - used),
+        "max_days_in_any_window": max_window,
+        "overstay": max_window > MAX_STAY_DAYS,
+    }
+    if planned_entry is not None:
+        latest = history.latest_exit(planned_entry.toordinal())
+        result["planned_entry"] = planned_entry
+        result["latest_exit"] = date.fromordinal(latest) if latest is not None else None
+        result["max_planned_stay_days"] = (latest - planned_entry.toordinal() + 1) if latest is not None else 0
+    return result
+
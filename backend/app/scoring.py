@@ -0,0 +1,221 @@
+# backend/app/scoring.py
+# Intake scoring - shared by the recommend endpoints and catalog-built tables
+
+import itertools
+from typing import Iterable, Optional, List, Dict
+
+from app.eligibility import EligibilityIndex
+from app.models import Flow
+from app.states import bit_positions
+
+# Intake questions, in IntakeAnswersV2 field order
+INTAKE_QUESTIONS = (
+    "nationality_type", "current_location", "urgency_level", "visit_purpose",
+    "visit_duration", "years_in_slovakia", "city",
+)
+
+# Calculate match score
+def calculate_flow_match_score(flow: Flow, answers: dict) -> tuple[float, list[str]]:
+    """
+    Calculate match score based on intake_matches rules.
+    Returns (score, reasons) where score is 0-100
+    """
+    if not flow.intake_matches:
+        # No matching rules - return low score
+        return 0.0, ["Flow has no intake_matches rules"]
+    
+    if flow.total_weight == 0:
+        return 0.0, ["Total weight is zero"]
+    
+    matched_weight = 0
+    reasons = []
+    
+    for match in flow.intake_matches:
+        # Skip if no question or weight
+        if not match.question or match.weight == 0:
+            continue
+        
+        # "Any" rules match even unanswered questions; others need the answer
+        if match.matches(answers.get(match.question)):
+            matched_weight += match.weight
+            if match.reason:
+                reasons.append(f"✓ {match.reason}")
+    
+    # Calculate percentage score
+    score = (matched_weight / flow.total_weight) * 100
+    
+    return score, reasons
+
+
+def confidence_level(score: float, confidence_threshold: float) -> str:
+    if score >= 85:
+        return "HIGH"
+    elif score >= confidence_threshold:
+        return "MEDIUM"
+    elif score >= 30:
+        return "LOW"
+    return "NONE"
+
+
+def score_flow(flow: Flow, answers: dict) -> dict:
+    """One ranked entry for a flow"""
+    score, reasons = calculate_flow_match_score(flow, answers)
+
+    return {
+        "flow_id": flow.flow_id,
+        "title": flow.display_info.title,
+        "score": score,
+        "confidence": confidence_level(score, flow.confidence_threshold),
+        "reasons": reasons,
+        "description": flow.display_info.description,
+    }
+
+
+def to_recommendation(best_match: dict) -> dict:
+    """FlowRecommendation fields for the top-ranked entry"""
+    return {
+        "flow_id": best_match['flow_id'],
+        "title": best_match['title'],
+        "confidence": best_match['confidence'],
+        "score": best_match['score'],
+        "reason": "; ".join(best_match['reasons'][:3]) if best_match['reasons'] else None,
+    }
+
+
+def rank_flows(flows: List[Flow], answers: dict) -> List[dict]:
+    """Score every flow, best first; flows that fail to score are skipped"""
+    scored_flows = []
+    for flow in flows:
+        try:
+            scored_flows.append(score_flow(flow, answers))
+        except Exception:
+            continue
+    scored_flows.sort(key=lambda x: x['score'], reverse=True)
+    return scored_flows
+
+
+def pick_flow(scores: Dict[int, float], eligible: Iterable[int]) -> Optional[int]:
+    """
+    Index of the flow to recommend, from every scored flow's score by
+    catalog index. Eligible flows win ties, but a flow the eligibility
+    rules exclude still wins if it scores strictly higher - the rules only
+    see part of the profile, so they never override a better match. Ties
+    otherwise go to the earlier flow, as rank_flows' stable sort does.
+    None if no flow was scored.
+    """
+    key = lambda i: (scores[i], -i)
+    best = max((i for i in eligible if i in scores), key=key, default=None)
+    overall = max(scores, key=key, default=None)
+    if overall is not None and (best is None or scores[overall] > scores[best]):
+        best = overall
+    return best
+
+
+def recommend(eligibility: EligibilityIndex, answers: dict) -> Optional[dict]:
+    """
+    Top-ranked entry for these answers (see pick_flow), or None if no flow
+    could be scored. When nothing matches, the top flow still comes back,
+    with confidence NONE.
+    """
+    entries = {}
+    for i, flow in enumerate(eligibility.flows):
+        try:
+            entries[i] = score_flow(flow, answers)
+        except Exception:
+            continue
+    best = pick_flow({i: e['score'] for i, e in entries.items()}, bit_positions(eligibility.candidates(answers)))
+    return entries[best] if best is not None else None
+
+
+def intake_answer_domains(flows: List[Flow]) -> Dict[str, List[Optional[str]]]:
+    """
+    Every answer value that can change a score, per question.
+    Scoring only compares answers against intake_matches values, so any
+    answer not listed scores exactly like no answer (None).
+    """
+    domains: Dict[str, List[Optional[str]]] = {q: [None] for q in INTAKE_QUESTIONS}
+    for flow in flows:
+        for match in flow.intake_matches:
+            if match.question not in domains or match.required_answer is None:
+                continue
+            required = match.required_answer
+            values = required if isinstance(required, tuple) else (required,)
+            for value in values:
+                if value is None or value in ('ANY', 'null'):
+                    continue
+                if str(value) not in domains[match.question]:
+                    domains[match.question].append(str(value))
+    return domains
+
+
+class IntakeWeights:
+    """
+    calculate_flow_match_score's rules compiled per question, for the
+    intake code that scores answers one question at a time: the weight
+    every flow gains from each answer value (`contributions`), and from
+    "any answer" matches (`base`). Every vector is in catalog flow order.
+    """
+
+    def __init__(self, flows: List[Flow], domains: Dict[str, List[Optional[str]]]):
+        self.base = tuple(
+            sum(m.weight for m in flow.intake_matches if m.question and m.weight != 0 and m.required_answer is None)
+            for flow in flows
+        )
+        self.contributions: Dict[str, Dict[Optional[str], tuple]] = {
+            q: {
+                value: tuple(
+                    sum(
+                        m.weight for m in flow.intake_matches
+                        if m.question == q and m.weight != 0 and m.required_answer is not None and m.matches(value)
+                    )
+                    for flow in flows
+                )
+                for value in values
+            }
+            for q, values in domains.items()
+        }
+
+    def contribution(self, question: str, answer: Optional[str]) -> tuple:
+        """Weight each flow gains from `question` answered `answer`; an answer outside the domain matches nothing"""
+        by_value = self.contributions[question]
+        weights = by_value.get(answer)
+        return weights if weights is not None else by_value[None]
+
+
+def recommendation_key(answers: Dict[str, Optional[str]], questions) -> str:
+    return "|".join(answers.get(q) or "" for q in questions)
+
+
+def iter_intakes(domains: Dict[str, List[Optional[str]]]):
+    """Every distinct intake (as an answers dict) over the answer domains"""
+    questions = list(domains)
+    for combo in itertools.product(*(domains[q] for q in questions)):
+        yield dict(zip(questions, combo))
+
+
+def recommendation_table(flows: List[Flow]) -> dict:
+    """
+    Exhaustive recommendation table. Keys join the answers in `questions`
+    order with "|" (empty = unanswered or a value outside the domain);
+    identical results are stored once in `results` and referenced by index.
+    Recommendations are picked like /recommend-flow-v2 (see recommend).
+    """
+    domains = intake_answer_domains(flows)
+    eligibility = EligibilityIndex(flows, domains)
+    questions = list(domains)
+    results: List[dict] = []
+    result_index: Dict[tuple, int] = {}
+    table: Dict[str, int] = {}
+
+    for answers in iter_intakes(domains):
+        best = recommend(eligibility, {k: v for k, v in answers.items() if v is not None})
+        if best is None:
+            continue
+        recommendation = to_recommendation(best)
+        key = tuple(recommendation.values())
+        if key not in result_index:
+            result_index[key] = len(results)
+            results.append(recommendation)
+        table[recommendation_key(answers, questions)] = result_index[key]
+
+    return {"questions": questions, "domains": domains, "results": results, "table": table}
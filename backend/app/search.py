@@ -0,0 +1,173 @@
+# backend/app/search.py
+# Full-text search over flows and steps - inverted index built at catalog load
+
+import bisect
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import List, Dict, Tuple
+
+# BM25 parameters (the usual defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Field weights: a hit in a title counts like three hits in a description
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "tags": 2.0,
+    "description": 1.0,
+    "why_it_matters": 1.0,
+    "failure_modes": 1.0,
+}
+
+# The last query token also matches longer terms (search as you type),
+# capped so a one-letter prefix can't expand to the whole vocabulary
+MAX_PREFIX_EXPANSIONS = 50
+
+# Light Slovak/English suffix stripping, longest first, so inflected forms
+# meet: "cudzineckej"/"cudzinecka" -> "cudzineck", "pobytu" -> "pobyt"
+SUFFIXES = (
+    "ami", "ach", "eho", "emu", "ych", "ymi", "ovi", "ove", "ova", "ovu",
+    "ou", "om", "ej", "ie", "ia", "iu",
+    "a", "e", "i", "o", "u", "y", "s",
+)
+MIN_STEM_LENGTH = 4
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip diacritics: "Cudzinecká polícia" -> "cudzinecka policia" """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def stem(token: str) -> str:
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            if suffix == "s" and token.endswith("ss"):
+                return token
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [stem(t) for t in TOKEN_RE.findall(fold(text))]
+
+
+def _text(value) -> str:
+    """Flatten strings, lists and dicts (e.g. failure_modes) into one string"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return " ".join(_text(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return " ".join(_text(v) for v in value)
+    return str(value)
+
+
+def flow_fields(flow: dict) -> Dict[str, str]:
+    display_info = flow.get('display_info', {})
+    return {
+        "title": _text(display_info.get('title', flow.get('title', ''))),
+        "tags": _text(display_info.get('tags', [])),
+        "description": _text(display_info.get('description', flow.get('description', ''))),
+    }
+
+
+def step_fields(step: dict) -> Dict[str, str]:
+    return {
+        "title": _text(step.get('title')),
+        "description": _text(step.get('description')),
+        "why_it_matters": _text(step.get('why_it_matters')),
+        "failure_modes": _text(step.get('failure_modes')),
+    }
+
+
+class SearchIndex:
+    """
+    Inverted index: term -> [(doc, BM25 weight)].
+    Documents are flows and steps; term frequencies are field-weighted and
+    the BM25 weight of every posting is computed at build, so a query only
+    sums precomputed numbers.
+    """
+
+    def __init__(self, flows: List[dict], steps_by_id: Dict[str, dict], step_flows: Dict[str, List[str]]):
+        self.docs: List[dict] = []
+        doc_lengths: List[float] = []
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+
+        def add(doc: dict, fields: Dict[str, str]):
+            doc_idx = len(self.docs)
+            self.docs.append(doc)
+            length = 0.0
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for term in tokenize(text):
+                    postings[term][doc_idx] = postings[term].get(doc_idx, 0.0) + weight
+                    length += weight
+            doc_lengths.append(length)
+
+        for flow in flows:
+            fields = flow_fields(flow)
+            add({"type": "flow", "id": flow.get('flow_id'), "title": fields["title"]}, fields)
+        for step_id, step in steps_by_id.items():
+            fields = step_fields(step)
+            add({
+                "type": "step",
+                "id": step_id,
+                "title": fields["title"],
+                "flows": step_flows.get(step_id, []),
+            }, fields)
+
+        n_docs = len(self.docs)
+        avg_length = (sum(doc_lengths) / n_docs) if n_docs else 1.0
+        # Length normalization is per document, so fold it in once here
+        norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) for length in doc_lengths]
+
+        self.postings: Dict[str, List[Tuple[int, float]]] = {}
+        for term, docs in postings.items():
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[term] = [
+                (doc_idx, idf * tf * (BM25_K1 + 1) / (tf + norms[doc_idx]))
+                for doc_idx, tf in docs.items()
+            ]
+        self.terms = sorted(self.postings)
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self.terms, prefix)
+        expanded = []
+        for term in self.terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            expanded.append(term)
+        return expanded
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        raw_tokens = TOKEN_RE.findall(fold(query))
+        if not raw_tokens:
+            return []
+
+        scores: Dict[int, float] = defaultdict(float)
+        last = len(raw_tokens) - 1
+        for i, raw in enumerate(raw_tokens):
+            term = stem(raw)
+            matched = [term] if term in self.postings else []
+            if i == last:
+                # Unfinished last word: "regis" finds "registration". Expand the
+                # word as typed - its stem ("regi") would also pull in "region"
+                matched += [t for t in self.expand_prefix(raw) if t != term]
+            best: Dict[int, float] = {}
+            for t in matched:
+                for doc_idx, weight in self.postings[t]:
+                    # One query word scores once per doc, by its best matching term
+                    if weight > best.get(doc_idx, 0.0):
+                        best[doc_idx] = weight
+            for doc_idx, weight in best.items():
+                scores[doc_idx] += weight
+
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:limit]
+        return [{**self.docs[doc_idx], "score": round(score, 4)} for doc_idx, score in ranked]
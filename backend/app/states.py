@@ -0,0 +1,179 @@
+# backend/app/states.py
+# State flags as bits - preconditions/outputs checks become integer ops
+
+from typing import Iterable, List, Dict, Tuple
+
+# Step files write "preconditions: [none]" for steps anyone can start
+NO_FLAG = "none"
+
+
+def bit_positions(mask: int) -> List[int]:
+    """Set bit positions, ascending"""
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+class StateRegistry:
+    """
+    Interns every state flag (legal_entry_completed, ...) into a bit index.
+    A set of flags is then one int: bit i set = i-th flag satisfied.
+    Ids are assigned in first-seen order, so the same catalog always
+    produces the same bits.
+    """
+
+    def __init__(self):
+        self.bits: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def intern(self, flag: str) -> int:
+        bit = self.bits.get(flag)
+        if bit is None:
+            bit = len(self.names)
+            self.bits[flag] = bit
+            self.names.append(flag)
+        return bit
+
+    def mask(self, flags: Iterable[str]) -> int:
+        """Mask for flags, interning unseen ones"""
+        mask = 0
+        for flag in flags:
+            if flag != NO_FLAG:
+                mask |= 1 << self.intern(flag)
+        return mask
+
+    def known_mask(self, flags: Iterable[str]) -> int:
+        """Mask for flags, ignoring ones the catalog never mentions"""
+        mask = 0
+        for flag in flags:
+            bit = self.bits.get(flag)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def flags(self, mask: int) -> List[str]:
+        return [self.names[bit] for bit in bit_positions(mask)]
+
+
+# Subset checks are written `mask & state == mask`: with both operands
+# non-negative CPython's AND only walks the shorter int, while `~state`
+# would allocate a full-width negative int on every check
+
+def unlocked_steps(state: int, steps: Iterable[Tuple[str, int, int]]) -> List[str]:
+    """Steps (id, precondition_mask, output_mask) that can be done now and aren't done yet"""
+    return [
+        step_id for step_id, pre, out in steps
+        if pre & state == pre and not (out and out & state == out)
+    ]
+
+
+def resolve_order(steps: List[Tuple[str, int, int]], state: int = 0) -> Tuple[List[List[str]], int]:
+    """
+    Resolver pass: repeatedly do every unlocked step, starting from `state`.
+    Returns the waves of step ids (each wave only needs earlier waves) and
+    the final state. Steps that never unlock are left out.
+    """
+    pending = list(steps)
+    waves: List[List[str]] = []
+    while pending:
+        wave, blocked = [], []
+        for step in pending:
+            (wave if step[1] & state == step[1] else blocked).append(step)
+        if not wave:
+            break
+        for _, _, out in wave:
+            state |= out
+        waves.append([step[0] for step in wave])
+        pending = blocked
+    return waves, state
+
+
+class FlowDependencies:
+    """
+    Dependency index of one flow, for progress queries.
+    Steps are numbered by position, so sets of steps are int masks too.
+    For every flag, `waiters` holds the steps that need it and `producers`
+    the steps that output it: a progress query only visits steps touched by
+    flags that are actually set, not the whole flow.
+    """
+
+    def __init__(self, steps: List[Tuple[str, int, int]]):
+        self.steps = steps
+        self.positions: Dict[str, int] = {}
+        for i, (step_id, _, _) in enumerate(steps):
+            self.positions.setdefault(step_id, i)
+        self.all_steps = (1 << len(steps)) - 1
+        self.roots = 0
+        self.waiters: Dict[int, int] = {}
+        self.producers: Dict[int, int] = {}
+        self.flags = 0
+        for i, (_, pre, out) in enumerate(steps):
+            if not pre:
+                self.roots |= 1 << i
+            for bit in bit_positions(pre):
+                self.waiters[bit] = self.waiters.get(bit, 0) | (1 << i)
+            for bit in bit_positions(out):
+                self.producers[bit] = self.producers.get(bit, 0) | (1 << i)
+            self.flags |= pre | out
+
+    def progress(self, completed: Iterable[str], state: int) -> Tuple[int, int, int, int]:
+        """
+        (done, unlocked, blocked, state) for completed step ids plus flags
+        already satisfied. The first three are step masks; done steps add
+        their outputs to the returned state. A step is done when listed or
+        when every flag it outputs is already set.
+        """
+        done = 0
+        for step_id in completed:
+            i = self.positions.get(step_id)
+            if i is not None:
+                done |= 1 << i
+                state |= self.steps[i][2]
+
+        set_flags = bit_positions(state & self.flags)
+        touched = 0
+        for bit in set_flags:
+            touched |= self.producers.get(bit, 0)
+        for i in bit_positions(touched & ~done):
+            out = self.steps[i][2]
+            if out & state == out:
+                done |= 1 << i
+
+        candidates = self.roots
+        for bit in set_flags:
+            candidates |= self.waiters.get(bit, 0)
+        unlocked = 0
+        for i in bit_positions(candidates & ~done):
+            pre = self.steps[i][1]
+            if pre & state == pre:
+                unlocked |= 1 << i
+
+        blocked = self.all_steps & ~done & ~unlocked
+        return done, unlocked, blocked, state
+
+
+def merge_flows(flows: List[List[Tuple[str, int, int]]]) -> Tuple[List[List[str]], int, List[str]]:
+    """
+    Unify several flows' steps into one plan. Steps shared by flows appear
+    once; flags no step in the plan produces (legal_entry_completed, ...)
+    are taken as given. Returns the dependency-ordered waves, the external
+    flags mask and the steps that can never unlock (cycles).
+    """
+    steps: List[Tuple[str, int, int]] = []
+    seen = set()
+    needed = produced = 0
+    for flow_steps in flows:
+        for step in flow_steps:
+            if step[0] not in seen:
+                seen.add(step[0])
+                steps.append(step)
+                needed |= step[1]
+                produced |= step[2]
+    external = needed & ~produced
+    waves, _ = resolve_order(steps, external)
+    placed = {step_id for wave in waves for step_id in wave}
+    unresolved = [step[0] for step in steps if step[0] not in placed]
+    return waves, external, unresolved
@@ -0,0 +1,121 @@
+# backend/app/timing.py
+# Per-request phase spans - Server-Timing headers and an optional trace file
+
+import contextlib
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+# Off unless SERVER_TIMING=1: the middleware isn't installed and span is bound
+# at import to a function returning a shared no-op context manager, so an
+# uninstrumented deployment pays one trivial call per span, with no lookups
+TIMING_ENABLED = os.environ.get("SERVER_TIMING", "") == "1"
+# Chrome trace event file (chrome://tracing, Perfetto, speedscope); needs SERVER_TIMING=1
+TRACE_PATH = os.environ.get("TRACE_FILE") or None
+
+# Spans of the request being handled: (name, start, end) in perf_counter seconds
+_request_spans: ContextVar[Optional[List[Tuple[str, float, float]]]] = ContextVar("request_spans", default=None)
+
+NO_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("name", "spans", "start")
+
+    def __init__(self, name: str, spans: list):
+        self.name = name
+        self.spans = spans
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.spans.append((self.name, self.start, time.perf_counter()))
+        return False
+
+
+def timed_span(name: str):
+    """
+    Time a phase of the current request: catalog (lookup, or the cold YAML
+    load), assembly, scoring, serialize. A no-op outside a timed request.
+    """
+    spans = _request_spans.get()
+    return NO_SPAN if spans is None else _Span(name, spans)
+
+
+def no_span(name: str):
+    """span() with SERVER_TIMING off"""
+    return NO_SPAN
+
+
+span = timed_span if TIMING_ENABLED else no_span
+
+
+class TraceFile:
+    """
+    Trace Event Format, JSON array flavour: the closing "]" is optional,
+    so events are appended as they happen and the file is readable at any
+    point. Every write is one request's events.
+    """
+
+    def __init__(self, path: str):
+        self.lock = threading.Lock()
+        self.file = open(path, "a", encoding="utf-8")
+        if self.file.tell() == 0:
+            self.file.write("[\n")
+        self.pid = os.getpid()
+
+    def write(self, label: str, start: float, end: float, spans: List[Tuple[str, float, float]]):
+        tid = threading.get_ident()
+        # Timestamps and durations in µs
+        events = [
+            {"name": name, "cat": cat, "ph": "X", "ts": round(s * 1e6, 3), "dur": round((e - s) * 1e6, 3),
+             "pid": self.pid, "tid": tid}
+            for name, cat, s, e in [(label, "request", start, end)] + [(n, "phase", s, e) for n, s, e in spans]
+        ]
+        lines = "".join(json.dumps(event, separators=(",", ":")) + ",\n" for event in events)
+        with self.lock:
+            self.file.write(lines)
+            self.file.flush()
+
+
+class ServerTimingMiddleware:
+    """
+    Collects the spans of each HTTP request and reports them as a
+    Server-Timing header (ms, plus "total" up to the response start),
+    and to the trace file if one is configured.
+    """
+
+    def __init__(self, app, trace_path: Optional[str] = TRACE_PATH):
+        self.app = app
+        self.trace = TraceFile(trace_path) if trace_path else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: List[Tuple[str, float, float]] = []
+        token = _request_spans.set(spans)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timings = [f"{name};dur={(e - s) * 1000:.3f}" for name, s, e in spans]
+                timings.append(f"total;dur={(time.perf_counter() - start) * 1000:.3f}")
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", ", ".join(timings).encode()),
+                    (b"timing-allow-origin", b"*"),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_spans.reset(token)
+            if self.trace is not None:
+                self.trace.write(f"{scope['method']} {scope['path']}", start, time.perf_counter(), spans)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Catalog versions and delta sync.
+
+Every flow and step has a content hash. data/catalog_history.json records,
+per catalog version, the hashes of every entity at that version, so a
+client that knows its version can be sent only what changed since.
+
+Record a new version after editing YAML (from backend/):
+    python -m app.versioning
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+from app.responses import dump_json
+
+ENTITY_KINDS = ("flows", "steps")
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:16]
+
+
+def entity_hash(entity: Any) -> str:
+    return body_hash(dump_json(entity))
+
+
+def catalog_hash(hashes: Dict[str, Dict[str, str]]) -> str:
+    digest = hashlib.sha256()
+    for kind in ENTITY_KINDS:
+        for entity_id, h in sorted(hashes.get(kind, {}).items()):
+            digest.update(f"{kind}/{entity_id}={h}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def load_history(history_path: Path) -> List[dict]:
+    """Recorded versions, oldest first. A missing file means no history yet."""
+    if not history_path.exists():
+        return []
+    try:
+        with open(history_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("versions", [])
+    except Exception as e:
+        print(f"Error loading {history_path}: {e}")
+        return []
+
+
+def resolve_version(history: List[dict], hashes: Dict[str, Dict[str, str]]) -> int:
+    """
+    Version number of the loaded content: the recorded version with the
+    same catalog hash, if any, else the number record_version will give
+    it. Versions only ever count up; two unrecorded deploys can share a
+    number, so clients tell content apart by its catalog hash.
+    """
+    current = catalog_hash(hashes)
+    for entry in reversed(history):
+        if catalog_hash(entry) == current:
+            return entry["version"]
+    return history[-1]["version"] + 1 if history else 1
+
+
+def diff_entities(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+    return {
+        "added": sorted(set(new) - set(old)),
+        "changed": sorted(i for i in set(new) & set(old) if new[i] != old[i]),
+        "removed": sorted(set(old) - set(new)),
+    }
+
+
+def _entity_map(ids: List[str], bodies: Dict[str, bytes]) -> bytes:
+    return b"{" + b",".join(dump_json(i) + b":" + bodies[i] for i in ids) + b"}"
+
+
+def build_patch(
+    since: Optional[int],
+    old_hashes: Optional[Dict[str, Dict[str, str]]],
+    version: int,
+    hashes: Dict[str, Dict[str, str]],
+    bodies: Dict[str, Dict[str, bytes]],
+) -> bytes:
+    """
+    Patch body from `old_hashes` to the current catalog, stitched from each
+    entity's serialized JSON (`bodies`). With no old hashes (unknown
+    `since`) the patch is a reset carrying every entity.
+    """
+    header = dump_json({
+        "since": since,
+        "version": version,
+        "catalog_hash": catalog_hash(hashes),
+        "reset": old_hashes is None,
+    })
+    parts = [header[:-1]]
+    for kind in ENTITY_KINDS:
+        diff = diff_entities((old_hashes or {}).get(kind, {}), hashes[kind])
+        parts.append(
+            b"," + dump_json(kind) + b':{"added":' + _entity_map(diff["added"], bodies[kind])
+            + b',"changed":' + _entity_map(diff["changed"], bodies[kind])
+            + b',"removed":' + dump_json(diff["removed"]) + b"}"
+        )
+    return b"".join(parts) + b"}"
+
+
+def record_version(history_path: Path, hashes: Dict[str, Dict[str, str]]) -> Optional[int]:
+    """Append the current hashes as a new version; None if nothing changed"""
+    history = load_history(history_path)
+    if history and catalog_hash(history[-1]) == catalog_hash(hashes):
+        return None
+
+    version = history[-1]["version"] + 1 if history else 1
+    history.append({"version": version, "catalog_hash": catalog_hash(hashes), **hashes})
+    with open(history_path, 'w', encoding='utf-8') as f:
+        json.dump({"versions": history}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return version
+
+
+def main() -> int:
+    from app.catalog import HISTORY_PATH, build_catalog
+
+    catalog = build_catalog()
+    version = record_version(HISTORY_PATH, catalog.entity_hashes)
+    if version is None:
+        print(f"Catalog unchanged (version {catalog.version})")
+    else:
+        print(f"✅ Recorded catalog version {version} in {HISTORY_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: async def vs plain def handlers over the in-memory catalog.
+
+A plain `def` route is run on the anyio worker pool (40 tokens by default),
+so under concurrency every request queues for a thread even though the
+work is a dict lookup. The same lookup as `async def` stays on the loop.
+
+Run from backend/:
+    python -m benchmarks.bench_async_handlers [--requests 4000] [--concurrency 200]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.catalog import get_catalog_sync
+
+
+def build_app(catalog) -> FastAPI:
+    bench_app = FastAPI()
+    flow_id = catalog.flows[0].flow_id
+
+    @bench_app.get("/sync/flow")
+    def sync_flow():
+        return {"flow_id": flow_id, "step_count": len(catalog.flow_step_refs[flow_id])}
+
+    @bench_app.get("/async/flow")
+    async def async_flow():
+        return {"flow_id": flow_id, "step_count": len(catalog.flow_step_refs[flow_id])}
+
+    return bench_app
+
+
+async def run(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            r = await client.get(path)
+            r.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - start
+
+
+async def main(total: int, concurrency: int):
+    bench_app = build_app(get_catalog_sync())
+    transport = httpx.ASGITransport(app=bench_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up both routes
+        await run(client, "/sync/flow", 200, concurrency)
+        await run(client, "/async/flow", 200, concurrency)
+
+        results = {}
+        for label in ("sync", "async"):
+            elapsed = await run(client, f"/{label}/flow", total, concurrency)
+            results[label] = total / elapsed
+            print(f"{label:>5} def: {total} requests in {elapsed:.3f}s -> {results[label]:,.0f} req/s")
+
+    print(f"async speedup: {results['async'] / results['sync']:.2f}x at concurrency {concurrency}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
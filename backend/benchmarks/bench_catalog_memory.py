@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory of the request-time catalog model.
+
+Compares the YAML dict-of-dicts (what handlers used to walk) with the typed,
+slotted Flow/Step records the catalog keeps, both measured with tracemalloc
+from the same files, then measures what a whole build_catalog() keeps:
+records, indexes and the prebuilt response bodies. If the catalog held on
+to the YAML dicts as well, it would show up in that last number.
+
+Run from backend/:
+    python -m benchmarks.bench_catalog_memory
+"""
+
+import gc
+import time
+import tracemalloc
+
+from app.catalog import build_catalog, load_all_flows, load_all_steps
+from app.models import Flow, Step
+from app.scoring import INTAKE_QUESTIONS, calculate_flow_match_score
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, size
+
+
+def load_dicts():
+    return load_all_flows(), load_all_steps()
+
+
+def load_typed():
+    flows, steps = load_all_flows(), load_all_steps()
+    typed = (
+        [Flow.from_dict(f) for f in flows],
+        {step_id: Step.from_dict(step_id, s) for step_id, s in steps.items()},
+    )
+    # Only the records survive - as in the catalog after load
+    del flows, steps
+    return typed
+
+
+def main():
+    _, dict_size = measure(load_dicts)
+    (flows, steps), typed_size = measure(load_typed)
+
+    print(f"flows: {len(flows)}  steps: {len(steps)}")
+    print(f"dict-of-dicts: {dict_size / 1024:8.0f} KiB")
+    print(f"typed records: {typed_size / 1024:8.0f} KiB  ({typed_size / dict_size:.0%} of dicts)")
+    _, catalog_size = measure(build_catalog)
+    print(f"build_catalog: {catalog_size / 1024:8.0f} KiB")
+
+    answers = dict.fromkeys(INTAKE_QUESTIONS, "NON_EU_VISA_REQUIRED")
+    rounds = 20000
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for flow in flows:
+            calculate_flow_match_score(flow, answers)
+    elapsed = time.perf_counter() - start
+    print(f"scoring all flows: {elapsed / rounds * 1e6:.1f} µs per intake")
+
+
+if __name__ == "__main__":
+    main()
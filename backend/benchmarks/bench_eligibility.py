@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: eligibility pre-filter in front of /recommend-flow-v2 scoring.
+
+First checks the inverted index against a plain per-flow reading of the
+eligibility rules for every distinct intake (plus unlisted answers), then
+times ranking every flow vs scoring.recommend (every flow scored, the
+candidates preferred on ties), with the catalog's flows copied --copies times.
+
+Run from backend/:
+    python -m benchmarks.bench_eligibility [--copies 1 10 100 1000] [--rounds 200]
+"""
+
+import argparse
+import dataclasses
+import random
+import time
+
+from app.catalog import build_catalog
+from app.eligibility import EligibilityIndex
+from app.scoring import intake_answer_domains, iter_intakes, rank_flows, recommend
+
+
+def allows(flow, field: str, *values) -> bool:
+    declared = flow.eligibility.get(field)
+    if declared is None:
+        return True
+    declared = declared if isinstance(declared, (list, tuple)) else [declared]
+    return "ANY" in declared or any(v in declared for v in values)
+
+
+def naive_eligible(flows, answers: dict, domains) -> list:
+    """The eligibility rules read flow by flow"""
+    known = {q: a for q, a in answers.items() if a in domains.get(q, ())}
+    nationality = known.get("nationality_type")
+    location = known.get("current_location")
+    purpose = known.get("visit_purpose")
+    out = []
+    for flow in flows:
+        ok = True
+        if nationality:
+            ok &= allows(flow, "nationality", nationality, "NON_EU" if nationality.startswith("NON_EU_") else nationality)
+            if nationality == "EU":
+                ok &= allows(flow, "requires_visa", False)
+            elif nationality == "NON_EU_VISA_REQUIRED":
+                ok &= allows(flow, "requires_visa", True)
+        if location:
+            ok &= allows(flow, "current_location", location)
+        if purpose:
+            ok &= allows(flow, "purpose", purpose)
+            if purpose in ("PERMANENT", "CITIZENSHIP"):
+                ok &= allows(flow, "lifecycle_phase", purpose)
+        if ok:
+            out.append(flow)
+    return out or flows
+
+
+def check_semantics(flows) -> int:
+    domains = intake_answer_domains(flows)
+    index = EligibilityIndex(flows, domains)
+    rng = random.Random(0)
+    checked = 0
+    for answers in iter_intakes(domains):
+        answers = {q: a for q, a in answers.items() if a is not None}
+        if rng.random() < 0.2:
+            answers[rng.choice(list(domains))] = "UNLISTED"
+        expected = [f.flow_id for f in naive_eligible(flows, answers, domains)]
+        got = [f.flow_id for f in index.eligible(answers)]
+        assert got == expected, (answers, got, expected)
+        checked += 1
+    return checked
+
+
+def main(copies_list, rounds: int):
+    catalog = build_catalog()
+    checked = check_semantics(catalog.flows)
+    print(f"semantics: {checked} intakes, index == per-flow rules")
+
+    domains = intake_answer_domains(catalog.flows)
+    profiles = [
+        {q: a for q, a in answers.items() if a is not None}
+        for answers in random.Random(1).sample(list(iter_intakes(domains)), rounds)
+    ]
+    print(f"\n{'flows':>6} {'candidates':>11} {'rank all':>12} {'recommend':>13}")
+    for copies in copies_list:
+        flows = [
+            dataclasses.replace(f, flow_id=f"{f.flow_id}_{i}") if i else f
+            for i in range(copies) for f in catalog.flows
+        ]
+        index = EligibilityIndex(flows, domains)
+        candidates = sum(len(index.eligible(a)) for a in profiles) / len(profiles)
+
+        start = time.perf_counter()
+        for answers in profiles:
+            rank_flows(flows, answers)
+        t_all = (time.perf_counter() - start) / len(profiles) * 1e6
+
+        start = time.perf_counter()
+        for answers in profiles:
+            recommend(index, answers)
+        t_filtered = (time.perf_counter() - start) / len(profiles) * 1e6
+
+        print(f"{len(flows):>6} {candidates:>11.1f} {t_all:>9.1f} µs {t_filtered:>10.1f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    main(args.copies, args.rounds)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: merging N flows into one dependency-ordered plan.
+
+Synthetic flows draw their steps from a shared pool (so merges have real
+overlap) and chain them through state flags. Times a cold merge as flow
+count and flow size grow, then the memoized /flows/merge path on the real
+catalog.
+
+Run from backend/:
+    python -m benchmarks.bench_flow_merge [--flows 2 5 10 50] [--sizes 10 50 200] [--rounds 50]
+"""
+
+import argparse
+import random
+import time
+
+from app.catalog import build_catalog
+from app.states import StateRegistry, merge_flows
+
+
+def synthetic_flows(n_flows: int, size: int, seed: int = 0):
+    """Flows of `size` steps from a pool of 2*size steps; step i needs 1-2 outputs of lower steps"""
+    rng = random.Random(seed)
+    registry = StateRegistry()
+    pool = []
+    for i in range(2 * size):
+        pre = [f"flag_{j}" for j in rng.sample(range(i), min(i, rng.randint(1, 2)))]
+        pool.append((f"step_{i}", registry.mask(pre), registry.mask([f"flag_{i}"])))
+    return [sorted(rng.sample(pool, size)) for _ in range(n_flows)]
+
+
+def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main(flow_counts, sizes, rounds: int):
+    print(f"{'flows':>6} {'steps/flow':>10} {'merged':>7} {'waves':>6} {'merge':>12}")
+    for size in sizes:
+        for n_flows in flow_counts:
+            flows = synthetic_flows(n_flows, size)
+            waves, _, _ = merge_flows(flows)
+            merged = sum(len(w) for w in waves)
+            t = timed(lambda: merge_flows(flows), rounds)
+            print(f"{n_flows:>6} {size:>10} {merged:>7} {len(waves):>6} {t:>9.1f} µs")
+
+    catalog = build_catalog()
+    flow_ids = list(catalog.flows_by_id)
+    print()
+    for n_flows in (2, 5, len(flow_ids)):
+        ids = flow_ids[:n_flows]
+
+        def cold():
+            catalog.merged_plans.clear()
+            catalog.merged_plan(ids)
+
+        t_cold = timed(cold, rounds)
+        t_memo = timed(lambda: catalog.merged_plan(ids), rounds * 100)
+        print(f"catalog, {n_flows:>2} flows: cold {t_cold:8.1f} µs  memoized {t_memo:6.2f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--flows", type=int, nargs="+", default=[2, 5, 10, 50])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    main(args.flows, args.sizes, args.rounds)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: incremental intake scoring vs rescoring every flow per answer.
+
+Replays random answer-change sequences (real answer values, values no flow
+asks about, and cleared answers) and checks after every change that the
+incremental score vector and recommendation equal a full rescore exactly.
+Then times one answer change both ways, with the catalog's flows copied
+--copies times to show how each scales with flow count.
+
+Run from backend/:
+    python -m benchmarks.bench_incremental_scoring [--sequences 500] [--changes 20] [--copies 1 10 100]
+"""
+
+import argparse
+import dataclasses
+import random
+import time
+
+from app.catalog import build_catalog
+from app.eligibility import EligibilityIndex
+from app.incremental import IncrementalScorer
+from app.scoring import INTAKE_QUESTIONS, IntakeWeights, calculate_flow_match_score, intake_answer_domains, recommend, to_recommendation
+
+
+def random_changes(rng: random.Random, domains, n: int):
+    for _ in range(n):
+        question = rng.choice(INTAKE_QUESTIONS)
+        roll = rng.random()
+        if roll < 0.15:
+            yield question, None
+        elif roll < 0.25:
+            yield question, f"unlisted_{rng.randint(0, 3)}"
+        else:
+            yield question, rng.choice([v for v in domains[question] if v is not None] or [None])
+
+
+def check_equivalence(flows, sequences: int, changes: int, seed: int = 0) -> int:
+    """Every state along every sequence must match a full rescore; returns states checked"""
+    rng = random.Random(seed)
+    domains = intake_answer_domains(flows)
+    eligibility = EligibilityIndex(flows, domains)
+    scorer = IncrementalScorer(flows, "bench", eligibility, IntakeWeights(flows, domains))
+    checked = 0
+    for _ in range(sequences):
+        state = scorer.initial
+        answers = {}
+        for question, answer in random_changes(rng, domains, changes):
+            state = scorer.apply(state, question, answer)
+            answers[question] = answer
+            answers = {q: a for q, a in answers.items() if a is not None}
+            # Token round trip on the way, as the endpoint does
+            state = scorer.decode(scorer.encode(state))
+
+            full = [calculate_flow_match_score(f, answers)[0] for f in flows]
+            assert scorer.scores(state) == full, (answers, scorer.scores(state), full)
+            best = recommend(eligibility, answers)
+            expected = to_recommendation(best) if best is not None else None
+            assert scorer.result(state)["recommendation"] == expected, (answers, expected)
+            checked += 1
+    return checked
+
+
+def copied_flows(flows, copies: int):
+    return [
+        dataclasses.replace(f, flow_id=f"{f.flow_id}_{i}") if i else f
+        for i in range(copies) for f in flows
+    ]
+
+
+def main(sequences: int, changes: int, copies_list):
+    catalog = build_catalog()
+    checked = check_equivalence(catalog.flows, sequences, changes)
+    print(f"equivalence: {checked} states over {sequences} sequences, all identical to full rescoring")
+
+    rng = random.Random(1)
+    domains = intake_answer_domains(catalog.flows)
+    print(f"\n{'flows':>6} {'full rescore':>14} {'delta':>10} {'delta+result':>12}")
+    for copies in copies_list:
+        flows = copied_flows(catalog.flows, copies)
+        eligibility = EligibilityIndex(flows, domains)
+        scorer = IncrementalScorer(flows, "bench", eligibility, IntakeWeights(flows, domains))
+        steps = list(random_changes(rng, domains, 2000))
+
+        answers = {}
+        start = time.perf_counter()
+        for question, answer in steps:
+            answers[question] = answer
+            given = {q: a for q, a in answers.items() if a is not None}
+            recommend(eligibility, given)
+        t_full = (time.perf_counter() - start) / len(steps) * 1e6
+
+        state = scorer.initial
+        start = time.perf_counter()
+        for question, answer in steps:
+            state = scorer.apply(state, question, answer)
+        t_delta = (time.perf_counter() - start) / len(steps) * 1e6
+
+        state = scorer.initial
+        start = time.perf_counter()
+        for question, answer in steps:
+            state = scorer.apply(state, question, answer)
+            scorer.result(state)
+        t_result = (time.perf_counter() - start) / len(steps) * 1e6
+
+        print(f"{len(flows):>6} {t_full:>11.1f} µs {t_delta:>7.1f} µs {t_result:>9.1f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sequences", type=int, default=500)
+    parser.add_argument("--changes", type=int, default=20)
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+    main(args.sequences, args.changes, args.copies)
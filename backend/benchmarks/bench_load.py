@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Load test: replay a seeded mix of API requests at fixed concurrency.
+
+Drives the app in-process over httpx's ASGI transport, or over a real
+socket against uvicorn started in a background thread (client and server
+then share one process; --url points at a separately started server
+instead, e.g. `uvicorn app.main:app --workers 1`). The request
+sequence (which route, which flow, which intake profile) comes from
+--seed, so two runs replay exactly the same traffic. Intake profiles are
+partially filled forms drawn from the answer values the catalog scores.
+
+Reports throughput and p50/p95/p99 latency, overall and per route, as
+JSON. Allocations are measured in a separate sequential in-process pass
+under tracemalloc (it slows everything down, so never during the timed
+run): peak bytes allocated while handling a request, and bytes still held
+after it.
+
+Run from backend/:
+    python -m benchmarks.bench_load [--transport asgi|uvicorn] [--url http://...] [--requests 5000] [--concurrency 50]
+        [--mix flows=1,flow=3,recommend=2] [--seed 0] [--allocations 300] [--out load.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import io
+import json
+import math
+import random
+import socket
+import threading
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.catalog import get_catalog_sync
+from app.main import app
+from app.scoring import INTAKE_QUESTIONS, intake_answer_domains
+
+# Share of questions a replayed intake profile answers
+ANSWER_RATE = 0.85
+DEFAULT_MIX = "flows=1,flow=3,recommend=2"
+HEADERS = {"accept-encoding": "gzip, br"}
+
+# (route label, method, path, JSON body)
+Request = Tuple[str, str, str, Optional[dict]]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("flows", "flow", "recommend"):
+            raise SystemExit(f"Unknown route in --mix: {name!r} (flows, flow, recommend)")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def build_requests(total: int, mix: Dict[str, float], seed: int) -> List[Request]:
+    """The whole replay, decided up front from the seed"""
+    rng = random.Random(seed)
+    catalog = get_catalog_sync()
+    flow_ids = list(catalog.flows_by_id)
+    domains = intake_answer_domains(catalog.flows)
+    routes, weights = zip(*mix.items())
+
+    requests = []
+    for route in rng.choices(routes, weights, k=total):
+        if route == "flows":
+            requests.append(("GET /flows", "GET", "/flows", None))
+        elif route == "flow":
+            requests.append(("GET /flow/{flow_id}", "GET", f"/flow/{rng.choice(flow_ids)}", None))
+        else:
+            profile = {
+                q: rng.choice([v for v in domains[q] if v is not None])
+                for q in INTAKE_QUESTIONS
+                if len(domains[q]) > 1 and rng.random() < ANSWER_RATE
+            }
+            requests.append(("POST /recommend-flow-v2", "POST", "/recommend-flow-v2", profile))
+    return requests
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def latency_summary(latencies: List[float]) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+    }
+
+
+async def replay(client: httpx.AsyncClient, requests: List[Request], concurrency: int) -> dict:
+    """Closed loop: `concurrency` workers, each sends its next request as soon as the last returns"""
+    queue = iter(requests)
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+
+    async def worker():
+        for label, method, path, body in queue:
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=HEADERS)
+            elapsed = time.perf_counter() - start
+            latencies.setdefault(label, []).append(elapsed)
+            if response.status_code >= 400:
+                errors[label] = errors.get(label, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    everything = [t for values in latencies.values() for t in values]
+    return {
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(everything) / duration, 1),
+        "latency": latency_summary(everything),
+        "errors": sum(errors.values()),
+        "by_route": {
+            label: {**latency_summary(values), "errors": errors.get(label, 0)}
+            for label, values in sorted(latencies.items())
+        },
+    }
+
+
+async def measure_allocations(requests: List[Request]) -> dict:
+    """Sequential in-process pass: tracemalloc peak and retained bytes per request"""
+    peaks: Dict[str, List[int]] = {}
+    retained: Dict[str, List[int]] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+        tracemalloc.start()
+        try:
+            for label, method, path, body in requests:
+                gc.collect()
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                await client.request(method, path, json=body, headers=HEADERS)
+                peak = tracemalloc.get_traced_memory()[1]
+                gc.collect()
+                current = tracemalloc.get_traced_memory()[0]
+                peaks.setdefault(label, []).append(peak - before)
+                retained.setdefault(label, []).append(current - before)
+        finally:
+            tracemalloc.stop()
+    return {
+        label: {
+            "requests": len(values),
+            "peak_bytes_mean": round(sum(values) / len(values)),
+            "peak_bytes_p95": percentile(sorted(values), 95),
+            "retained_bytes_mean": round(sum(retained[label]) / len(retained[label])),
+        }
+        for label, values in sorted(peaks.items())
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def uvicorn_server():
+    """uvicorn serving the app on a free local port, in a background thread"""
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("--transport uvicorn needs uvicorn (pip install -r requirements.txt)")
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise SystemExit("uvicorn failed to start")
+        time.sleep(0.01)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+@contextlib.asynccontextmanager
+async def client_for(transport: str, concurrency: int, url: Optional[str] = None):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if url:
+        async with httpx.AsyncClient(base_url=url, limits=limits) as client:
+            yield client
+    elif transport == "asgi":
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load") as client:
+            yield client
+    else:
+        with uvicorn_server() as base_url:
+            async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+                yield client
+
+
+async def main(args) -> dict:
+    mix = parse_mix(args.mix)
+    requests = build_requests(args.requests + args.warmup, mix, args.seed)
+    warmup, timed = requests[:args.warmup], requests[args.warmup:]
+
+    # Keep the app's console output (catalog load warnings) out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        async with client_for(args.transport, args.concurrency, args.url) as client:
+            await replay(client, warmup, args.concurrency)
+            result = await replay(client, timed, args.concurrency)
+        allocations = await measure_allocations(timed[:args.allocations]) if args.allocations else None
+
+    return {
+        "transport": args.url or args.transport,
+        "requests": len(timed),
+        "concurrency": args.concurrency,
+        "mix": mix,
+        "seed": args.seed,
+        **result,
+        "allocations": allocations,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--url", help="load an already running server instead (overrides --transport)")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="route=weight list over flows, flow, recommend")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--allocations", type=int, default=300, help="requests in the tracemalloc pass (0 = skip)")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = json.dumps(asyncio.run(main(args)), indent=2)
+    print(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(report + "\n")
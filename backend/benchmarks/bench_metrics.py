@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request cost of the metrics middleware.
+
+Times the bare recording call, the middleware around a no-op ASGI app,
+and real routes called in-process with and without MetricsMiddleware in
+the stack; then the cost of rendering /metrics and building EMF lines.
+
+Run from backend/:
+    python -m benchmarks.bench_metrics [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.catalog import get_catalog_sync
+from app.main import app
+from app.metrics import Metrics, MetricsMiddleware
+
+
+class FakeRoute:
+    path = "/flow/{flow_id}"
+
+
+def http_scope(path: str) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def noop_app(scope, receive, send):
+    scope["route"] = FakeRoute
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def per_request(asgi_app, path: str, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        await asgi_app(http_scope(path), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def without_metrics(fastapi_app):
+    """The app's middleware stack with MetricsMiddleware left out"""
+    kept = [m for m in fastapi_app.user_middleware if m.cls is not MetricsMiddleware]
+    saved, fastapi_app.user_middleware = fastapi_app.user_middleware, kept
+    try:
+        return fastapi_app.build_middleware_stack()
+    finally:
+        fastapi_app.user_middleware = saved
+
+
+async def main(n: int):
+    recorder = Metrics()
+    start = time.perf_counter()
+    for i in range(n):
+        recorder.observe_request("/flow/{flow_id}", "GET", 200, (i % 100) / 1000)
+    print(f"observe_request:           {(time.perf_counter() - start) / n * 1e6:6.2f} µs")
+
+    bare = await per_request(noop_app, "/noop", n)
+    wrapped = await per_request(MetricsMiddleware(noop_app), "/noop", n)
+    print(f"no-op app:                 {bare:6.2f} µs  with middleware {wrapped:6.2f} µs  (+{wrapped - bare:.2f} µs)")
+
+    catalog = get_catalog_sync()
+    flow_id = catalog.flows[0].flow_id
+    with_stack = app.build_middleware_stack()
+    without_stack = without_metrics(app)
+    for path in ("/flows", f"/flow/{flow_id}", "/catalog/manifest"):
+        await per_request(with_stack, path, 200)  # warm up
+        t_without = await per_request(without_stack, path, n // 10)
+        t_with = await per_request(with_stack, path, n // 10)
+        print(f"{path[:26]:<26} {t_without:6.1f} µs  with middleware {t_with:6.1f} µs  (+{t_with - t_without:.2f} µs)")
+
+    for route in range(30):
+        for status in (200, 304, 404):
+            recorder.observe_request(f"/route/{route}", "GET", status, 0.003)
+    start = time.perf_counter()
+    for _ in range(100):
+        recorder.prometheus()
+    print(f"/metrics render (30 routes): {(time.perf_counter() - start) / 100 * 1e6:6.1f} µs")
+
+    recorder.emf = True
+    recorder.observe_request("/flow/{flow_id}", "GET", 200, 0.004)
+    recorder.cache_lookup("schedules", True)
+    start = time.perf_counter()
+    documents = recorder.emf_documents()
+    print(f"EMF documents, one invocation: {(time.perf_counter() - start) * 1e6:6.1f} µs ({len(documents)} lines)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
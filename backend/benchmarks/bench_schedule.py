@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: critical-path scheduling of large synthetic flows.
+
+Each synthetic step needs 1-2 flags of earlier steps, takes 1-30 days
+(a third of them in working days) and every tenth has a deadline.
+Times a cold schedule by flow size, then cold vs memoized on the real catalog.
+
+Run from backend/:
+    python -m benchmarks.bench_schedule [--sizes 10 100 1000] [--rounds 20]
+"""
+
+import argparse
+import random
+import time
+from datetime import date
+
+from app.catalog import build_catalog
+from app.models import Deadline, Duration, Step
+from app.schedule import schedule_flow
+from app.states import StateRegistry
+
+ANCHOR = date(2026, 3, 2)
+
+
+def synthetic_flow(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    registry = StateRegistry()
+    steps, records = [], {}
+    for i in range(size):
+        step_id = f"step_{i}"
+        pre = tuple(f"flag_{j}" for j in rng.sample(range(i), min(i, rng.randint(1, 2))))
+        out = (f"flag_{i}",)
+        days = rng.randint(1, 30)
+        records[step_id] = Step(
+            step_id=step_id, title=step_id, description=None, preconditions=pre, outputs=out,
+            duration=Duration(days, days, working_days=rng.random() < 0.33),
+            deadline=Deadline(rng.randint(3, 90), True, pre[0] if pre else None) if i % 10 == 0 else None,
+        )
+        steps.append((step_id, registry.mask(pre), registry.mask(out)))
+    return steps, records, registry
+
+
+def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main(sizes, rounds: int):
+    print(f"{'steps':>6} {'critical':>9} {'schedule':>12}")
+    for size in sizes:
+        steps, records, registry = synthetic_flow(size)
+        result = schedule_flow(steps, records, registry, ANCHOR)
+        t = timed(lambda: schedule_flow(steps, records, registry, ANCHOR), rounds)
+        print(f"{size:>6} {len(result['critical_path']):>9} {t / 1000:>9.2f} ms")
+
+    catalog = build_catalog()
+    print()
+    for flow_id in list(catalog.flows_by_id)[:3]:
+        def cold():
+            catalog.schedules.clear()
+            catalog.flow_schedule(flow_id, ANCHOR)
+
+        t_cold = timed(cold, rounds)
+        t_memo = timed(lambda: catalog.flow_schedule(flow_id, ANCHOR), rounds * 100)
+        print(f"{flow_id:48} cold {t_cold:8.1f} µs  memoized {t_memo:5.2f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    main(args.sizes, args.rounds)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Schengen stay calculator vs a naive per-day scan.
+
+Random travel histories of growing size. Both compute days used and the
+worst 180-day window; the interval/prefix-sum version is checked against
+the naive count before timing.
+
+Run from backend/:
+    python -m benchmarks.bench_schengen [--trips 10 100 1000] [--rounds 20]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from app.schengen import WINDOW_DAYS, calculate_stay
+
+
+def random_trips(n_trips: int, seed: int = 0):
+    """Trips of 1-20 days with 0-60 day gaps, ending around `on`"""
+    rng = random.Random(seed)
+    trips, day = [], date(2000, 1, 1)
+    for _ in range(n_trips):
+        day += timedelta(days=rng.randint(0, 60))
+        end = day + timedelta(days=rng.randint(0, 19))
+        trips.append((day, end))
+        day = end + timedelta(days=1)
+    rng.shuffle(trips)
+    return trips, day
+
+
+def naive_stay(trips, on: date) -> dict:
+    """Days used on `on` and the worst window, counting day by day"""
+    present = set()
+    for entry, exit in trips:
+        day = entry
+        while day <= exit:
+            present.add(day)
+            day += timedelta(days=1)
+
+    def window(day: date) -> int:
+        return sum(1 for i in range(WINDOW_DAYS) if day - timedelta(days=i) in present)
+
+    worst, day = 0, min(present)
+    while day <= on:
+        worst = max(worst, window(day))
+        day += timedelta(days=1)
+    return {"days_used": window(on), "max_days_in_any_window": worst}
+
+
+def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main(trip_counts, rounds: int):
+    print(f"{'trips':>6}  {'calculator':>12}  {'naive scan':>12}  {'batch x100':>12}")
+    for n_trips in trip_counts:
+        trips, on = random_trips(n_trips)
+        fast, naive = calculate_stay(trips, on), naive_stay(trips, on)
+        assert all(fast[k] == v for k, v in naive.items())
+
+        t_fast = timed(lambda: calculate_stay(trips, on, on), rounds)
+        t_naive = timed(lambda: naive_stay(trips, on), max(1, rounds // 10))
+        travellers = [random_trips(n_trips, seed) for seed in range(100)]
+        t_batch = timed(lambda: [calculate_stay(t, d, d) for t, d in travellers], max(1, rounds // 10))
+        print(f"{n_trips:>6}  {t_fast:>9.1f} µs  {t_naive:>9.1f} µs  {t_batch / 1000:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trips", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    main(args.trips, args.rounds)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: search index size and query latency.
+
+Run from backend/:
+    python -m benchmarks.bench_search [--rounds 2000]
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from app.catalog import build_catalog, load_all_flows, load_all_steps
+from app.search import SearchIndex
+
+QUERIES = [
+    "cudzinecká polícia",
+    "cudzinecka policia",
+    "prechodný pobyt",
+    "bank account",
+    "health insurance",
+    "regis",
+    "criminal record apostille",
+    "tourist 90 days",
+]
+
+
+def main(rounds: int):
+    catalog = build_catalog()
+    # The index is built from the YAML dicts, as during catalog load
+    flows, steps = load_all_flows(), load_all_steps()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    index = SearchIndex(flows, steps, catalog.step_flows)
+    build_ms = (time.perf_counter() - start) * 1000
+    size_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    n_postings = sum(len(p) for p in index.postings.values())
+    print(f"docs: {len(index.docs)}  terms: {len(index.terms)}  postings: {n_postings}")
+    print(f"build: {build_ms:.1f} ms  index size: {size_bytes / 1024:.0f} KiB (tracemalloc)")
+    print()
+
+    for query in QUERIES:
+        timings = []
+        for _ in range(rounds):
+            t = time.perf_counter()
+            index.search(query)
+            timings.append((time.perf_counter() - t) * 1e6)
+        timings.sort()
+        p50 = statistics.median(timings)
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        top = index.search(query, 1)
+        top_id = top[0]["id"] if top else "-"
+        print(f"{query!r:32} p50 {p50:7.1f} µs  p99 {p99:7.1f} µs  top: {top_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.rounds)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of phase spans and the Server-Timing middleware.
+
+Times span() with SERVER_TIMING off (what every instrumented route pays),
+the timed span() outside and inside a timed request, then real routes called
+in-process without the middleware, with it, and with it writing a trace
+file.
+
+Routes only record spans when SERVER_TIMING=1 at import (span is bound
+then), so run the route columns with it set.
+
+Run from backend/:
+    SERVER_TIMING=1 python -m benchmarks.bench_server_timing [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from app.catalog import get_catalog_sync
+from app.main import app
+from app.timing import ServerTimingMiddleware, _request_spans, no_span, timed_span
+from benchmarks.bench_metrics import http_scope, receive, send
+
+
+async def per_request(asgi_app, path: str, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        await asgi_app(http_scope(path), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def per_span(span, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        with span("assembly"):
+            pass
+    return (time.perf_counter() - start) / n * 1e9
+
+
+async def main(n: int):
+    print(f"span(), timing off:        {per_span(no_span, n * 20):6.0f} ns")
+    print(f"span(), no timed request:  {per_span(timed_span, n * 20):6.0f} ns")
+    token = _request_spans.set([])
+    print(f"span(), timed request:     {per_span(timed_span, n * 20):6.0f} ns")
+    _request_spans.reset(token)
+
+    catalog = get_catalog_sync()
+    flow_id = catalog.flows[0].flow_id
+    stack = app.build_middleware_stack()
+    timed = ServerTimingMiddleware(stack, trace_path=None)
+    with tempfile.TemporaryDirectory() as tmp:
+        traced = ServerTimingMiddleware(stack, trace_path=os.path.join(tmp, "trace.json"))
+        print(f"\n{'route':<28} {'off':>9} {'header':>9} {'+trace':>9}")
+        for path in ("/flows", f"/flow/{flow_id}", "/catalog/manifest"):
+            await per_request(stack, path, 200)  # warm up
+            t_off = await per_request(stack, path, n)
+            t_on = await per_request(timed, path, n)
+            t_trace = await per_request(traced, path, n)
+            print(f"{path[:28]:<28} {t_off:6.1f} µs {t_on:6.1f} µs {t_trace:6.1f} µs")
+        traced.trace.file.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
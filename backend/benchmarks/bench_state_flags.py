@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bitmask state flags vs set-of-strings precondition checks.
+
+Builds synthetic catalogs (each step needs a few flags produced by earlier
+steps) and times the unlocked-steps check and a full resolver pass both ways.
+--vocab caps how many distinct flags exist (the real catalog has ~150);
+0 gives every step fresh flags, so masks grow as wide as the catalog.
+
+Run from backend/:
+    python -m benchmarks.bench_state_flags [--steps 100 1000 10000] [--vocab 256 0] [--rounds 50]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from app.states import StateRegistry, resolve_order, unlocked_steps
+
+
+def synthetic_steps(n_steps: int, vocab: int, seed: int = 0):
+    """(step_id, preconditions, outputs) with 1-3 preconditions from earlier outputs"""
+    rng = random.Random(seed)
+    steps, produced, seen = [], [], set()
+    for i in range(n_steps):
+        pre = rng.sample(produced, min(len(produced), rng.randint(1, 3)))
+        if vocab:
+            out = [f"flag_{rng.randrange(vocab)}" for _ in range(rng.randint(1, 2))]
+        else:
+            out = [f"flag_{i}_{k}" for k in range(rng.randint(1, 2))]
+        for flag in out:
+            if flag not in seen:
+                seen.add(flag)
+                produced.append(flag)
+        steps.append((f"step_{i}", pre, out))
+    rng.shuffle(steps)
+    return steps
+
+
+def set_unlocked(state: set, steps):
+    return [
+        step_id for step_id, pre, out in steps
+        if pre <= state and not (out and out <= state)
+    ]
+
+
+def set_resolve(steps, state: set):
+    pending, waves = list(steps), []
+    while pending:
+        wave, blocked = [], []
+        for step in pending:
+            (wave if step[1] <= state else blocked).append(step)
+        if not wave:
+            break
+        for _, _, out in wave:
+            state |= out
+        waves.append([step[0] for step in wave])
+        pending = blocked
+    return waves, state
+
+
+def timed(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main(sizes, vocabs, rounds: int):
+    print(
+        f"{'steps':>7} {'flags':>7}  {'unlocked sets':>14} {'bits':>9}"
+        f"  {'resolve sets':>13} {'bits':>10}  {'state sets':>11} {'bits':>7}"
+    )
+    for n_steps, vocab in [(n, v) for v in vocabs for n in sizes]:
+        raw = synthetic_steps(n_steps, vocab)
+        set_steps = [(step_id, frozenset(pre), frozenset(out)) for step_id, pre, out in raw]
+        registry = StateRegistry()
+        bit_steps = [(step_id, registry.mask(pre), registry.mask(out)) for step_id, pre, out in raw]
+
+        # A user about halfway through
+        set_state = set_resolve(set_steps[: n_steps // 2], set())[1]
+        bit_state = registry.known_mask(set_state)
+
+        assert set_unlocked(set_state, set_steps) == unlocked_steps(bit_state, bit_steps)
+        assert set_resolve(set_steps, set())[0] == resolve_order(bit_steps)[0]
+
+        t_unlock_set = timed(lambda: set_unlocked(set_state, set_steps), rounds)
+        t_unlock_bit = timed(lambda: unlocked_steps(bit_state, bit_steps), rounds)
+        t_resolve_set = timed(lambda: set_resolve(set_steps, set()), rounds)
+        t_resolve_bit = timed(lambda: resolve_order(bit_steps), rounds)
+        print(
+            f"{n_steps:>7} {len(registry.names):>7}  {t_unlock_set:>11.1f} µs {t_unlock_bit:>6.1f} µs"
+            f"  {t_resolve_set:>10.1f} µs {t_resolve_bit:>7.1f} µs"
+            f"  {sys.getsizeof(set_state):>9} B {sys.getsizeof(bit_state):>5} B"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--vocab", type=int, nargs="+", default=[256, 0])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    main(args.steps, args.vocab, args.rounds)
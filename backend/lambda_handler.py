@@ -1,5 +1,17 @@
 from mangum import Mangum
 from app.main import app
+from app.metrics import metrics
 
 # Mangum adapts FastAPI for AWS Lambda
-handler = Mangum(app, lifespan="off")
+asgi_handler = Mangum(app, lifespan="off")
+
+# Request metrics go to CloudWatch as Embedded Metric Format log lines
+metrics.emf = True
+
+
+def handler(event, context):
+    try:
+        return asgi_handler(event, context)
+    finally:
+        # One batched write per invocation
+        metrics.flush_emf()
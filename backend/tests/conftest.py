@@ -0,0 +1,17 @@
+# backend/tests/conftest.py
+# Shared fixtures - tests run against the real catalog in data/
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# `pytest` from backend/ or the repo root: make `app` importable either way
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.catalog import build_catalog  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def catalog():
+    return build_catalog()
@@ -0,0 +1,130 @@
+# backend/tests/test_eligibility.py
+# Eligibility pre-filter scenarios, on a small hand-written catalog
+
+from app.eligibility import EligibilityIndex
+from app.models import Flow
+from app.scoring import intake_answer_domains, iter_intakes, rank_flows, recommend
+
+DOMAINS = {
+    "nationality_type": [None, "EU", "NON_EU_VISA_REQUIRED", "NON_EU_VISA_FREE"],
+    "current_location": [None, "IN_SK", "OUTSIDE_SK"],
+    "visit_purpose": [None, "EMPLOYMENT", "TOURISM", "PERMANENT", "CITIZENSHIP"],
+}
+
+
+def flow(flow_id: str, matches=(), **eligibility) -> Flow:
+    return Flow.from_dict({
+        "flow_id": flow_id,
+        "eligibility": eligibility,
+        "intake_matches": [
+            {"question": q, "required_answer": a, "weight": w, "reason": f"{q}={a}"} for q, a, w in matches
+        ],
+    })
+
+
+FLOWS = [
+    flow("eu_employee", nationality="EU", purpose="EMPLOYMENT", lifecycle_phase="FIRST_ENTRY", requires_visa=False),
+    flow("non_eu_employee", nationality="NON_EU", purpose="EMPLOYMENT", lifecycle_phase="FIRST_ENTRY", requires_visa=True),
+    flow("visa_tourist", nationality="NON_EU_VISA_REQUIRED", lifecycle_phase="FIRST_ENTRY", requires_visa=True),
+    flow("permanent", nationality="ANY", current_location="IN_SK", lifecycle_phase="PERMANENT"),
+    flow("citizenship", nationality="ANY", lifecycle_phase="CITIZENSHIP"),
+    flow("anyone"),
+]
+
+
+def eligible_ids(answers: dict) -> list:
+    return [f.flow_id for f in EligibilityIndex(FLOWS, DOMAINS).eligible(answers)]
+
+
+def test_eu_nationals_excluded_from_visa_required_flows():
+    ids = eligible_ids({"nationality_type": "EU"})
+    assert "non_eu_employee" not in ids
+    assert "visa_tourist" not in ids
+    assert "eu_employee" in ids
+
+
+def test_visa_free_non_eu_kept_for_non_eu_flows():
+    ids = eligible_ids({"nationality_type": "NON_EU_VISA_FREE"})
+    assert "non_eu_employee" in ids
+    # ...but not for flows written for visa-required nationals only
+    assert "visa_tourist" not in ids
+    assert "eu_employee" not in ids
+
+
+def test_visa_required_non_eu_kept_for_non_eu_flows():
+    ids = eligible_ids({"nationality_type": "NON_EU_VISA_REQUIRED"})
+    assert {"non_eu_employee", "visa_tourist"} <= set(ids)
+    assert "eu_employee" not in ids
+
+
+def test_permanent_purpose_keeps_permanent_phase_only():
+    assert eligible_ids({"visit_purpose": "PERMANENT"}) == ["permanent", "anyone"]
+
+
+def test_citizenship_purpose_keeps_citizenship_phase_only():
+    assert eligible_ids({"visit_purpose": "CITIZENSHIP"}) == ["citizenship", "anyone"]
+
+
+def test_other_purposes_dont_filter_on_lifecycle():
+    ids = eligible_ids({"visit_purpose": "EMPLOYMENT"})
+    assert {"eu_employee", "non_eu_employee", "permanent", "citizenship"} <= set(ids)
+
+
+def test_unlisted_answers_are_ignored():
+    everything = [f.flow_id for f in FLOWS]
+    assert eligible_ids({"nationality_type": "MARTIAN"}) == everything
+    assert eligible_ids({"visit_purpose": "SABBATICAL", "current_location": "MOON"}) == everything
+    assert eligible_ids({"nationality_type": "EU", "visit_purpose": "SABBATICAL"}) == eligible_ids({"nationality_type": "EU"})
+
+
+def test_no_candidates_falls_back_to_every_flow():
+    flows = FLOWS[:3]
+    index = EligibilityIndex(flows, DOMAINS)
+    # An EU tourist: every one of these flows rules it out
+    assert index.eligible({"nationality_type": "EU", "visit_purpose": "TOURISM"}) == flows
+
+
+def test_recommend_falls_back_when_no_eligible_flow_matches():
+    flows = [
+        flow("eu_only", [("visit_purpose", "EMPLOYMENT", 10)], nationality="EU"),
+        flow("non_eu_tourist", [("visit_purpose", "TOURISM", 10)], nationality="NON_EU"),
+    ]
+    index = EligibilityIndex(flows, intake_answer_domains(flows) | {"nationality_type": [None, "EU"]})
+    # eu_only is the only eligible flow but scores 0 for tourism
+    best = recommend(index, {"nationality_type": "EU", "visit_purpose": "TOURISM"})
+    assert best["flow_id"] == "non_eu_tourist"
+    assert recommend(index, {"nationality_type": "EU", "visit_purpose": "EMPLOYMENT"})["flow_id"] == "eu_only"
+    # Nothing matches: still the top-ranked flow, with confidence NONE
+    best = recommend(index, {"nationality_type": "EU"})
+    assert best["flow_id"] == "eu_only"
+    assert best["confidence"] == "NONE"
+
+
+def test_recommend_prefers_eligible_flows_on_ties_only():
+    flows = [
+        flow("non_eu", [("visit_purpose", "EMPLOYMENT", 10), ("city", "BRATISLAVA", 10)], nationality="NON_EU"),
+        flow("eu", [("visit_purpose", "EMPLOYMENT", 10)], nationality="EU"),
+    ]
+    index = EligibilityIndex(flows, intake_answer_domains(flows) | {"nationality_type": [None, "EU", "NON_EU_VISA_FREE"]})
+    # Both score 100: non_eu ranks first overall, but eu is the eligible one
+    answers = {"nationality_type": "EU", "visit_purpose": "EMPLOYMENT", "city": "BRATISLAVA"}
+    assert recommend(index, answers)["flow_id"] == "eu"
+    # ...while an excluded flow that scores higher still wins (100 vs 50)
+    answers = {"nationality_type": "NON_EU_VISA_FREE", "visit_purpose": "EMPLOYMENT"}
+    assert recommend(index, answers)["flow_id"] == "eu"
+
+
+def test_catalog_recommendations_never_weaker_than_unfiltered_ranking(catalog):
+    for intake in iter_intakes(intake_answer_domains(catalog.flows)):
+        answers = {k: v for k, v in intake.items() if v is not None}
+        best = recommend(catalog.eligibility, answers)
+        unfiltered = rank_flows(catalog.flows, answers)[0]
+        assert best["score"] == unfiltered["score"], answers
+        if best["flow_id"] != unfiltered["flow_id"]:
+            assert best["flow_id"] in {f.flow_id for f in catalog.eligibility.eligible(answers)}, answers
+
+
+def test_catalog_recommends_for_every_intake(catalog):
+    best = recommend(catalog.eligibility, {"nationality_type": "EU", "visit_purpose": "TOURISM"})
+    assert best is not None
+    assert len(catalog.recommendations["table"]) == len(list(iter_intakes(catalog.recommendations["domains"])))
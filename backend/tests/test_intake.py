@@ -0,0 +1,58 @@
+# backend/tests/test_intake.py
+# Adaptive intake (POST /intake/next-question) on small hand-written catalogs
+
+from app.intake import IntakeModel
+from app.models import Flow
+from app.scoring import INTAKE_QUESTIONS, IntakeWeights, recommendation_table
+
+
+def flow(flow_id: str, matches=()) -> Flow:
+    return Flow.from_dict({
+        "flow_id": flow_id,
+        "intake_matches": [
+            {"question": q, "required_answer": a, "weight": w, "reason": f"{q}={a}"} for q, a, w in matches
+        ],
+    })
+
+
+def intake(flows) -> IntakeModel:
+    recommendations = recommendation_table(flows)
+    return IntakeModel(flows, recommendations, IntakeWeights(flows, recommendations["domains"]))
+
+
+def test_only_questions_with_options_are_asked():
+    model = intake([
+        flow("employee", [("visit_purpose", "EMPLOYMENT", 10)]),
+        flow("student", [("visit_purpose", "STUDY", 10)]),
+    ])
+    step = model.next_step({})
+    assert step["status"] == "question"
+    assert step["question"] == "visit_purpose"
+    assert step["options"] == ["EMPLOYMENT", "STUDY"]
+
+    step = model.next_step({"visit_purpose": "STUDY"})
+    assert step["status"] == "recommendation"
+    assert step["recommendation"]["flow_id"] == "student"
+
+
+def test_nothing_left_to_ask_without_a_recommendation():
+    # No flows: no answer has any option, and the table is empty
+    model = intake([])
+    step = model.next_step({})
+    assert step["status"] == "no_match"
+    assert step["recommendation"] is None
+
+    step = model.next_step(dict.fromkeys(INTAKE_QUESTIONS, "ANYTHING"))
+    assert step == {"status": "no_match", "recommendation": None, "questions_answered": len(INTAKE_QUESTIONS)}
+
+
+def test_every_answer_given_is_terminal(catalog):
+    answers = {
+        "nationality_type": "NON_EU_VISA_REQUIRED", "current_location": "OUTSIDE_SK",
+        "visit_purpose": "STUDY", "visit_duration": "LONG_STAY", "urgency_level": "MARTIAN",
+        "years_in_slovakia": "5-7", "city": "BRATISLAVA",
+    }
+    assert set(answers) == set(INTAKE_QUESTIONS)
+    step = catalog.intake.next_step(answers)
+    assert step["status"] == "recommendation"
+    assert step["questions_answered"] == len(INTAKE_QUESTIONS)
@@ -0,0 +1,55 @@
+# backend/tests/test_profiling.py
+# Token-gated profiling around a small app with CORS
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from app.profiling import ProfilingMiddleware
+
+TOKEN = "secret"
+
+
+def profiled_app(directory):
+    app = FastAPI()
+    app.add_middleware(CORSMiddleware, allow_origins=["*"])
+    app.add_middleware(ProfilingMiddleware, token=TOKEN, sample_rate=0, directory=directory, keep=2)
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    return app
+
+
+def get(app, path, headers):
+    async def request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path, headers=headers)
+    return asyncio.run(request())
+
+
+def test_inline_profile_keeps_cors_headers(tmp_path):
+    response = get(profiled_app(tmp_path), "/ping", {
+        "origin": "https://example.org", "x-profile-token": TOKEN, "x-profile-output": "inline",
+    })
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.headers["x-profiled-status"] == "200"
+    assert "cumulative" in response.text
+    assert (tmp_path / response.headers["x-profile-id"]).exists()
+
+
+def test_profiles_rotate_and_bad_tokens_are_ignored(tmp_path):
+    app = profiled_app(tmp_path)
+    for _ in range(4):
+        assert "x-profile-id" in get(app, "/ping", {"x-profile-token": TOKEN}).headers
+    assert len(list(tmp_path.glob("*.pstats"))) == 2
+
+    response = get(app, "/ping", {"x-profile-token": "wrong"})
+    assert "x-profile-id" not in response.headers
+    assert response.json() == {"pong": True}
@@ -0,0 +1,25 @@
+# backend/tests/test_projections.py
+# ?fields= projections serve steps exactly as the full responses do
+
+import json
+
+import pytest
+
+from app.projections import STEP_FIELDS, parse_fields, FLOW_PRESETS
+
+
+def flow_body(catalog, flow_id, fields=None):
+    key, selected = parse_fields(fields, FLOW_PRESETS, STEP_FIELDS)
+    return json.loads(catalog.flow_projection(flow_id, key, selected).body)
+
+
+@pytest.mark.parametrize("fields", ["duration,deadline", "required_documents", ",".join(STEP_FIELDS)])
+def test_custom_projection_steps_match_full_flow(catalog, fields):
+    selected = fields.split(",")
+    for flow_id in catalog.flows_by_id:
+        full = flow_body(catalog, flow_id)["steps"]
+        projected = flow_body(catalog, flow_id, fields)["steps"]
+        assert len(projected) == len(full)
+        for full_step, step in zip(full, projected):
+            expected = {k: v for k, v in full_step.items() if k in selected}
+            assert step == {"step_id": full_step["step_id"], **expected}
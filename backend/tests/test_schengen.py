@@ -0,0 +1,122 @@
+# backend/tests/test_schengen.py
+# Schengen calculator against a day-by-day reference, and at the edges of the date range
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.schengen import (
+    EARLIEST_ON, LATEST_PLANNED_ENTRY, MAX_STAY_DAYS, WINDOW_DAYS, StayError, calculate_stay,
+)
+
+
+def days_present(stays) -> set:
+    present = set()
+    for entry, exit in stays:
+        present.update(entry + timedelta(days=i) for i in range((exit - entry).days + 1))
+    return present
+
+
+def window(present: set, day: date) -> int:
+    return sum(1 for i in range(WINDOW_DAYS) if day - timedelta(days=i) in present)
+
+
+def reference_stay(stays, on: date, planned_entry: date) -> dict:
+    """calculate_stay's result, counted one day at a time"""
+    present = days_present(stays)
+    used = window(present, on)
+    worst = 0
+    if present:
+        day = min(present)
+        while day <= max(present) + timedelta(days=WINDOW_DAYS - 1):
+            worst = max(worst, window(present, day))
+            day += timedelta(days=1)
+
+    # Stay from planned_entry without a break for as long as every day's
+    # window (earlier stays plus the days since entry) stays within the limit
+    earlier = {day for day in present if day < planned_entry}
+    latest = None
+    for length in range(1, MAX_STAY_DAYS + 1):
+        last = planned_entry + timedelta(days=length - 1)
+        if window(earlier | days_present([(planned_entry, last)]), last) > MAX_STAY_DAYS:
+            break
+        latest = last
+    return {
+        "window_start": on - timedelta(days=WINDOW_DAYS - 1),
+        "days_used": used,
+        "days_remaining": max(0, MAX_STAY_DAYS - used),
+        "max_days_in_any_window": worst,
+        "overstay": worst > MAX_STAY_DAYS,
+        "latest_exit": latest,
+        "max_planned_stay_days": (latest - planned_entry).days + 1 if latest else 0,
+    }
+
+
+def assert_matches_reference(stays, on: date, planned_entry: date):
+    result = calculate_stay(stays, on, planned_entry)
+    expected = reference_stay(stays, on, planned_entry)
+    assert {k: result[k] for k in expected} == expected, (stays, on, planned_entry)
+    return result
+
+
+def test_overlapping_stays_count_each_day_once():
+    stays = [(date(2024, 1, 1), date(2024, 1, 10)), (date(2024, 1, 5), date(2024, 1, 15))]
+    result = assert_matches_reference(stays, date(2024, 1, 20), date(2024, 2, 1))
+    assert result["days_used"] == 15
+    assert result["days_remaining"] == MAX_STAY_DAYS - 15
+
+
+def test_stay_spanning_the_window_start():
+    on = date(2024, 7, 1)
+    window_start = on - timedelta(days=WINDOW_DAYS - 1)
+    stays = [(window_start - timedelta(days=5), window_start + timedelta(days=4))]
+    result = assert_matches_reference(stays, on, on)
+    assert result["window_start"] == window_start
+    assert result["days_used"] == 5
+
+
+def test_overstay_detected_in_a_past_window():
+    # 100 days in a row, long ago: over the limit then, nothing used now
+    stays = [(date(2023, 1, 1), date(2023, 4, 10))]
+    result = assert_matches_reference(stays, date(2024, 6, 1), date(2024, 6, 1))
+    assert result["overstay"]
+    assert result["days_used"] == 0 and result["days_remaining"] == MAX_STAY_DAYS
+
+
+def test_latest_exit_after_recent_stays():
+    stays = [(date(2024, 1, 1), date(2024, 3, 20))]  # 80 days
+    result = assert_matches_reference(stays, date(2024, 4, 1), date(2024, 4, 1))
+    assert result["latest_exit"] == date(2024, 4, 10)
+    assert result["max_planned_stay_days"] == 10
+    # Entering while already at the limit
+    full = [(date(2024, 1, 1), date(2024, 3, 30))]
+    assert assert_matches_reference(full, date(2024, 4, 1), date(2024, 3, 31))["latest_exit"] is None
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_histories_match_reference(seed):
+    rng = random.Random(seed)
+    start = date(2023, 1, 1)
+    stays = []
+    for _ in range(rng.randint(0, 8)):
+        entry = start + timedelta(days=rng.randint(0, 500))
+        stays.append((entry, entry + timedelta(days=rng.randint(0, 40))))
+    on = start + timedelta(days=rng.randint(0, 600))
+    assert_matches_reference(stays, on, on + timedelta(days=rng.randint(-30, 60)))
+
+
+def test_earliest_and_latest_dates_are_computed():
+    result = calculate_stay([(date(1, 1, 1), date(1, 1, 2))], EARLIEST_ON, LATEST_PLANNED_ENTRY)
+    assert result["window_start"] == date(1, 1, 1)
+    assert result["days_used"] == 2
+    assert result["latest_exit"] == date.max
+
+
+@pytest.mark.parametrize("on, planned_entry", [
+    (date(1, 1, 5), None),
+    (date(2025, 1, 1), date(9999, 12, 30)),
+])
+def test_out_of_range_dates_raise_stay_error(on, planned_entry):
+    with pytest.raises(StayError):
+        calculate_stay([], on, planned_entry)
@@ -0,0 +1,88 @@
+# backend/tests/test_versioning.py
+# Catalog version numbers and delta-sync patches
+
+import json
+
+from app.catalog import Catalog, HISTORY_PATH, load_all_flows, load_all_steps, load_history
+from app.versioning import catalog_hash, record_version, resolve_version
+
+HASHES = {"flows": {"a": "1"}, "steps": {"s": "1"}}
+
+
+def edited(catalog_flows, note):
+    return [dict(catalog_flows[0], note=note)] + catalog_flows[1:]
+
+
+def test_recorded_content_keeps_its_version():
+    history = [
+        {"version": 1, **HASHES},
+        {"version": 2, "flows": {"a": "2"}, "steps": {"s": "1"}},
+    ]
+    assert resolve_version(history, {"flows": {"a": "2"}, "steps": {"s": "1"}}) == 2
+    # Rolled back to version 1's content
+    assert resolve_version(history, HASHES) == 1
+
+
+def test_unrecorded_content_gets_the_next_version():
+    history = [{"version": 3, **HASHES}]
+    assert resolve_version(history, {"flows": {"a": "2"}, "steps": {"s": "1"}}) == 4
+    assert resolve_version([], HASHES) == 1
+
+
+def test_record_version_appends_the_next_number(tmp_path):
+    path = tmp_path / "history.json"
+    assert record_version(path, HASHES) == 1
+    assert record_version(path, HASHES) is None
+    assert record_version(path, {"flows": {"a": "2"}, "steps": {"s": "1"}}) == 2
+    versions = json.loads(path.read_text())["versions"]
+    assert [v["version"] for v in versions] == [1, 2]
+    assert versions[0]["catalog_hash"] == catalog_hash(HASHES)
+
+
+def test_patch_between_unrecorded_deploys_is_a_reset():
+    flows, steps, history = load_all_flows(), load_all_steps(), load_history(HISTORY_PATH)
+    deploy_a = Catalog(edited(flows, "edit A"), steps, history)
+    deploy_b = Catalog(edited(flows, "edit B"), steps, history)
+    # Same number, told apart by the catalog hash
+    assert deploy_a.version == deploy_b.version
+    assert deploy_a.catalog_hash != deploy_b.catalog_hash
+
+    assert json.loads(deploy_b.change_payload(deploy_a.version, deploy_a.catalog_hash).body)["reset"]
+    assert json.loads(deploy_b.change_payload(deploy_b.version).body)["reset"]
+    assert json.loads(deploy_b.change_payload(deploy_b.version, deploy_b.catalog_hash).body)["reset"] is False
+
+
+def test_version_stays_put_when_unrecorded_content_is_recorded(tmp_path):
+    path = tmp_path / "history.json"
+    flows, steps = load_all_flows(), load_all_steps()
+    record_version(path, Catalog(flows, steps).entity_hashes)
+
+    # A client syncs to an edit before anyone records it...
+    unrecorded = Catalog(edited(flows, "edit"), steps, load_history(path))
+    seen_version, seen_hash = unrecorded.version, unrecorded.catalog_hash
+    assert seen_version == 2
+
+    # ...then the same content is recorded and redeployed
+    assert record_version(path, unrecorded.entity_hashes) == seen_version
+    recorded = Catalog(edited(flows, "edit"), steps, load_history(path))
+    assert recorded.version == seen_version and recorded.catalog_hash == seen_hash
+    patch = json.loads(recorded.change_payload(seen_version, seen_hash).body)
+    assert patch["reset"] is False
+    assert not any(patch[kind][change] for kind in ("flows", "steps") for change in ("added", "changed", "removed"))
+    # The next edit gets a higher number
+    assert Catalog(edited(flows, "edit 2"), steps, load_history(path)).version == seen_version + 1
+
+
+def test_patches_from_recorded_versions(catalog):
+    for version in catalog.version_hashes:
+        patch = json.loads(catalog.change_payload(version).body)
+        assert patch["since"] == version and patch["version"] == catalog.version
+    assert json.loads(catalog.change_payload(None).body)["reset"]
+
+
+def test_reset_patch_carries_entities_as_served(catalog):
+    patch = json.loads(catalog.change_payload(None).body)
+    flows = {f["flow_id"]: f for f in load_all_flows()}
+    assert patch["flows"]["added"] == json.loads(json.dumps(flows, default=str))
+    for step_id, step in patch["steps"]["added"].items():
+        assert step == json.loads(catalog.step_payloads[step_id].body)